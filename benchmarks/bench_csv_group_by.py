@@ -0,0 +1,90 @@
+"""CSV 分组透视回归基准
+
+生成键高度重复的测试用例导出表（默认 5 万行，模块、用例名都大量重复），按 group_by 解析，
+校验结构并报告耗时：
+  - 单列分组：每个模块只出现一次，行挂在模块之下，同名用例按出现顺序追加 (2)、(3)… 序号
+  - 多列分组：模块 → 测试项 两级分组，同值的行归入同一分组节点
+解析耗时超过 --budget-s 或结构不符时以非零状态退出，用于发现同名探测退化为平方复杂度之类的回归。
+
+用法: python benchmarks/bench_csv_group_by.py [--rows 50000] [--modules 20] [--cases 60] [--budget-s 5]
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.json2xmind import Json2xmindTool  # noqa: E402
+
+
+def build_csv(rows: int, modules: int, cases: int) -> str:
+    """模块、测试项、用例名循环重复的导出表"""
+    lines = ["模块,用例,测试项,结果"]
+    for i in range(rows):
+        lines.append(f"模块{i % modules},用例{i % cases},测试项{i % 3},通过")
+    return "\n".join(lines)
+
+
+def check_single_column(data: dict, rows: int, modules: int, cases: int) -> list[str]:
+    errors = []
+    if len(data) != modules:
+        errors.append(f"单列分组: 期望 {modules} 个模块节点，实际 {len(data)}")
+    attached = sum(len(group) for group in data.values())
+    if attached != rows:
+        errors.append(f"单列分组: 期望挂载 {rows} 行，实际 {attached}")
+    # 模块0 中 用例0 每隔 lcm(modules, cases) 行出现一次，最后一次出现带序号 (repeats)
+    first = data.get("模块0", {})
+    repeats = len(range(0, rows, math.lcm(modules, cases)))
+    if repeats > 1 and f"用例0 ({repeats})" not in first:
+        errors.append(f"单列分组: 缺少同名序号 '用例0 ({repeats})'")
+    if first.get("用例0") != {"测试项": "测试项0", "结果": "通过"}:
+        errors.append(f"单列分组: 行内容不符: {first.get('用例0')}")
+    return errors
+
+
+def check_two_columns(data: dict, rows: int, modules: int) -> list[str]:
+    errors = []
+    if len(data) != modules:
+        errors.append(f"两级分组: 期望 {modules} 个模块节点，实际 {len(data)}")
+    attached = sum(len(items) for group in data.values() for items in group.values())
+    if attached != rows:
+        errors.append(f"两级分组: 期望挂载 {rows} 行，实际 {attached}")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000, help='数据行数')
+    parser.add_argument('--modules', type=int, default=20, help='不同模块数')
+    parser.add_argument('--cases', type=int, default=60, help='不同用例名数')
+    parser.add_argument('--budget-s', type=float, default=5.0, help='每种分组方式的解析耗时上限 (秒)')
+    args = parser.parse_args()
+
+    tool = Json2xmindTool.from_credentials({})
+    csv_text = build_csv(args.rows, args.modules, args.cases)
+    print(f"{args.rows} rows, input {len(csv_text.encode('utf-8')) / 1024:.0f} KB")
+
+    failures = []
+    for name, group_by in (("模块", ["模块"]), ("模块,测试项", ["模块", "测试项"])):
+        start = time.perf_counter()
+        data = tool._parse_csv_to_dict(csv_text, group_by=group_by)
+        elapsed = time.perf_counter() - start
+        print(f"  group_by={name:<12} {elapsed:7.3f}s  top-level nodes={len(data)}")
+        if len(group_by) == 1:
+            failures += check_single_column(data, args.rows, args.modules, args.cases)
+        else:
+            failures += check_two_columns(data, args.rows, args.modules)
+        if elapsed > args.budget_s:
+            failures.append(f"group_by={name}: 解析耗时 {elapsed:.2f}s 超出上限 {args.budget_s:.2f}s")
+
+    if failures:
+        print("\n❌ 分组透视回归:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""输出体积对比基准
+
+用同一批样例数据分别以 standard、compact、compact + fold_leaves 生成 .xmind，
+报告压缩后/解压后大小、节点数和耗时，用于评估精简输出的收益。
+
+用法: python benchmarks/bench_output_size.py [--modules 200] [--fanout 10] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.json2xmind import Json2xmindTool  # noqa: E402
+
+PROFILES = [
+    ("standard", {}),
+    ("compact", {"output_profile": "compact"}),
+    ("compact+fold", {"output_profile": "compact", "fold_leaves": True}),
+]
+
+
+def build_payloads(modules: int, fanout: int) -> dict:
+    """生成几类典型输入：配置型（大量基础类型叶子）、列表型和带元数据的测试用例"""
+    config = {
+        f"服务{m}": {"版本": f"1.{m}", "端口": 8000 + m, "启用": m % 2 == 0, "备注": None,
+                   "地址": f"https://svc{m}.example.com", "标签": [f"tag{i}" for i in range(3)]}
+        for m in range(modules)
+    }
+    lists = {f"分类{m}": [f"条目 {m}-{i}" for i in range(fanout)] for m in range(modules)}
+    cases = {
+        f"模块{m}": {
+            f"用例{c}": {"_priority": c % 6 + 1, "_task": "half", "_note": "前置条件与预期结果", "步骤": c, "结果": "通过"}
+            for c in range(fanout)
+        }
+        for m in range(modules)
+    }
+    return {"config": config, "lists": lists, "cases": cases}
+
+
+def measure(tool: Json2xmindTool, data: dict, params: dict, repeat: int) -> dict:
+    """多次转换取最快耗时，返回最后一次的结果统计"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        messages = list(tool._invoke({"json_data": json.dumps(data, ensure_ascii=False), **params}))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        result = [m.message.json_object for m in messages if hasattr(m.message, 'json_object')][-1]
+    return {"seconds": best, **result}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modules', type=int, default=200, help='每类样例的顶层节点数')
+    parser.add_argument('--fanout', type=int, default=10, help='列表/用例的扇出')
+    parser.add_argument('--repeat', type=int, default=5, help='每种模式的重复次数')
+    args = parser.parse_args()
+
+    tool = Json2xmindTool.from_credentials({})
+    payloads = build_payloads(args.modules, args.fanout)
+
+    print(f"{'payload':<8} {'profile':<14} {'archive':>10} {'xml':>11} {'nodes':>8} {'time':>8}")
+    for payload_name, data in payloads.items():
+        baseline = None
+        for profile_name, params in PROFILES:
+            stats = measure(tool, data, params, args.repeat)
+            baseline = baseline or stats["file_size"]
+            print(f"{payload_name:<8} {profile_name:<14} {stats['file_size']:>10,} {stats['uncompressed_size']:>11,} "
+                  f"{stats['statistics']['total_nodes']:>8,} {stats['seconds'] * 1000:>6.0f}ms "
+                  f"({stats['file_size'] / baseline:.0%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""结构预览基准
+
+预览只显示前 PREVIEW_MAX_NODES 个节点，构建预览树时也只应创建这部分主题。本脚本生成超宽的输入
+（默认 2 万个键 × 每键 5 个子节点，约 22 万个主题），计时构建与渲染预览（不含 JSON 解析），
+并校验显示与省略的节点数；耗时超过 --budget-ms 或统计不符时以非零状态退出。
+
+用法: python benchmarks/bench_preview.py [--keys 20000] [--children 5] [--budget-ms 500]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.preview import PREVIEW_MAX_NODES, build_preview_tree, render_preview  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--keys', type=int, default=20000, help='顶层键数')
+    parser.add_argument('--children', type=int, default=5, help='每个键的子节点数')
+    parser.add_argument('--repeat', type=int, default=3, help='重复次数，取最快一次')
+    parser.add_argument('--budget-ms', type=float, default=500, help='构建与渲染的耗时上限 (毫秒)')
+    args = parser.parse_args()
+
+    data = {f"键{i}": {f"子{j}": f"值{j}" for j in range(args.children)} for i in range(args.keys)}
+    # 每个键一个主题，每个子节点一个主题加一个值主题
+    total = args.keys * (1 + 2 * args.children)
+
+    best = float('inf')
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        root, omitted = build_preview_tree(data, "预览基准", 10, 3, {})
+        _, statistics = render_preview(root, 'markdown', 3, omitted)
+        best = min(best, time.perf_counter() - start)
+    print(f"{total} topics: {best * 1000:.1f} ms, shown={statistics['nodes_shown']}, omitted={statistics['nodes_omitted']}")
+
+    failures = []
+    if statistics['nodes_shown'] != min(total, PREVIEW_MAX_NODES):
+        failures.append(f"显示节点数 {statistics['nodes_shown']}，期望 {min(total, PREVIEW_MAX_NODES)}")
+    if statistics['nodes_shown'] + statistics['nodes_omitted'] != total:
+        failures.append(f"显示 + 省略 = {statistics['nodes_shown'] + statistics['nodes_omitted']}，期望 {total}")
+    if best * 1000 > args.budget_ms:
+        failures.append(f"耗时 {best * 1000:.0f} ms 超出上限 {args.budget_ms:.0f} ms")
+
+    if failures:
+        print("\n❌ 预览回归:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
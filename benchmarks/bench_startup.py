@@ -0,0 +1,125 @@
+"""插件冷启动基准
+
+在全新的子进程中按 main.py 的方式构造 Plugin(DifyPluginEnv(...))（会加载 provider 与全部工具模块），
+随后立即以一个小负载调用 json2xmind，分阶段报告：
+  - import dify_plugin 耗时
+  - Plugin 构造耗时（含工具模块导入）
+  - 首次调用的首条消息与完整结果耗时
+并用 -X importtime 统计各 tools.* 模块及其依赖的累计导入时间。
+
+可用 --budget-ms 设置「进程启动到首个完整结果」的中位数上限，超出时以非零状态退出，用于发现冷启动回归。
+
+用法: python benchmarks/bench_startup.py [--runs 5] [--budget-ms 3000] [--no-compile]
+"""
+import argparse
+import compileall
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 子进程探针：逐阶段计时，以 STARTUP 前缀输出一行 JSON（SDK 日志同样写到标准输出）
+PROBE = r'''
+import json, os, sys, time
+start = time.perf_counter()
+import dify_plugin
+imported = time.perf_counter()
+import main
+constructed = time.perf_counter()
+if os.environ.get("BENCH_PRELOAD"):
+    from tools.converter import preload
+    preload()
+preloaded = time.perf_counter()
+# 会话对象的构造由守护进程负责（其依赖在正式运行时已导入），不计入首次调用
+tool = main.plugin.registration.get_tool_cls("json2xmind", "json2xmind").from_credentials({})
+requested = time.perf_counter()
+messages = tool.invoke({"json_data": json.dumps({"项目": {"目标": "上线", "_priority": 1}})})
+next(messages)
+first_message = time.perf_counter()
+result = [m.message.json_object for m in messages if hasattr(m.message, "json_object")][-1]
+finished = time.perf_counter()
+print("STARTUP " + json.dumps({
+    "import_sdk": imported - start,
+    "construct_plugin": constructed - imported,
+    "preload": preloaded - constructed,
+    "first_message": first_message - requested,
+    "first_result": finished - requested,
+    "total": finished - start - (requested - preloaded),
+    "success": result.get("success"),
+}), flush=True)
+# 跳过解释器退出阶段（gevent 下线程收尾与本基准无关）
+os._exit(0)
+'''
+
+PHASES = ["import_sdk", "construct_plugin", "preload", "first_message", "first_result", "total"]
+
+
+def run_probe(preload: bool) -> dict:
+    env = dict(os.environ, BENCH_PRELOAD="1" if preload else "")
+    completed = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, env=env, capture_output=True, text=True, timeout=120)
+    for line in completed.stdout.splitlines():
+        if line.startswith("STARTUP "):
+            return json.loads(line[len("STARTUP "):])
+    raise RuntimeError(f"探针未输出结果 (exit {completed.returncode}):\n{completed.stderr[-2000:]}")
+
+
+def import_times() -> list[tuple[str, int]]:
+    """构造 Plugin 时各模块的累计导入时间（微秒），只保留插件自身及其引入的第三方模块"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import dify_plugin; import main; os = __import__('os'); os._exit(0)"],
+        cwd=ROOT, capture_output=True, text=True, timeout=120,
+    )
+    rows = []
+    in_plugin = False
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # dify_plugin 完整导入后出现的模块才由 main.py/工具模块引入
+        if name.strip() == "dify_plugin" and not name.startswith("  "):
+            in_plugin = True
+            continue
+        if in_plugin and not name.strip().startswith("dify_plugin"):
+            rows.append((name.rstrip(), int(cumulative)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='每种模式的子进程次数')
+    parser.add_argument('--budget-ms', type=float, default=None, help='进程启动到首个完整结果的中位数上限 (ms)')
+    parser.add_argument('--no-compile', action='store_true', help='不预先编译字节码（模拟首次部署后的第一次启动）')
+    args = parser.parse_args()
+
+    if not args.no_compile:
+        compileall.compile_dir(os.path.join(ROOT, "tools"), quiet=1)
+        compileall.compile_dir(os.path.join(ROOT, "provider"), quiet=1)
+
+    medians = {}
+    for preload in (False, True):
+        runs = [run_probe(preload) for _ in range(args.runs)]
+        if not all(run["success"] for run in runs):
+            print("首次调用失败")
+            sys.exit(1)
+        label = "with background preload" if preload else "cold"
+        print(f"{label} ({args.runs} runs, median ms):")
+        for phase in PHASES:
+            value = statistics.median(run[phase] for run in runs) * 1000
+            print(f"  {phase:<17} {value:8.1f}")
+        medians[preload] = statistics.median(run["total"] for run in runs) * 1000
+
+    print("\nimports triggered by main.py (cumulative ms):")
+    for name, cumulative in import_times():
+        if cumulative >= 500 or name.strip().startswith("tools"):
+            print(f"  {cumulative / 1000:7.1f}  {name}")
+
+    if args.budget_ms is not None and medians[False] > args.budget_ms:
+        print(f"\n❌ 冷启动到首个结果 {medians[False]:.0f} ms，超出预算 {args.budget_ms:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""分块输出基准（实验性的 experimental_stream_output）
+
+对同一份大型导图分别以整体输出（一个 blob 消息）和分块输出（逐块 BLOB_CHUNK）调用 json2xmind，
+报告从调用开始到首个文件字节的耗时（TTFB）、总耗时，以及调用期间插件事件循环最长的停顿
+（另一个协程每 10 ms 计时一次；大任务在转换进程池中完成时，停顿只来自输入解析与消息发送）。
+校验两种方式生成的 .xmind 逐字节一致（content_hash 相同）、分块输出的 total_length 等于文件长度；
+另外在构建好的同一个工作簿上比较 save 与 write_archive 写入临时文件时写出阶段的峰值内存
+（tracemalloc，不含 DOM 本身）。
+
+用法: python benchmarks/bench_streaming.py [--modules 300] [--fanout 20] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 导入 dify_plugin 时会执行 gevent 的 monkey.patch_all，计时线程与守护进程中一样是协程
+from dify_plugin.entities.tool import ToolInvokeMessage  # noqa: E402
+
+from tools.converter import XmindConverter  # noqa: E402
+from tools.json2xmind import Json2xmindTool  # noqa: E402
+
+FILE_MESSAGES = (ToolInvokeMessage.BlobMessage, ToolInvokeMessage.BlobChunkMessage)
+TICK_INTERVAL = 0.01
+
+
+def build_payload(modules: int, fanout: int) -> dict:
+    """带元数据与长文本的测试用例树，节点数约为 modules * fanout * 6"""
+    return {
+        f"模块{m}": {
+            f"用例{c}": {"_priority": c % 6 + 1, "_note": "前置条件与预期结果 " * 4, "步骤": [f"步骤{s}" for s in range(3)], "结果": "通过"}
+            for c in range(fanout)
+        }
+        for m in range(modules)
+    }
+
+
+def measure(tool: Json2xmindTool, json_data: str, params: dict) -> dict:
+    """调用一次工具，拼接收到的文件分块，记录首字节耗时、总耗时与事件循环的最长停顿"""
+    stalls = []
+    done = threading.Event()
+
+    def tick():
+        last = time.perf_counter()
+        while not done.is_set():
+            time.sleep(TICK_INTERVAL)
+            now = time.perf_counter()
+            stalls.append(now - last - TICK_INTERVAL)
+            last = now
+
+    ticker = threading.Thread(target=tick)
+    ticker.start()
+    start = time.perf_counter()
+    first_byte = None
+    blob = bytearray()
+    total_lengths = set()
+    result = None
+    try:
+        for message in tool._invoke({"json_data": json_data, **params}):
+            if isinstance(message.message, ToolInvokeMessage.BlobChunkMessage):
+                total_lengths.add(message.message.total_length)
+            if isinstance(message.message, FILE_MESSAGES) and message.message.blob:
+                if first_byte is None:
+                    first_byte = time.perf_counter() - start
+                blob += message.message.blob
+            elif hasattr(message.message, 'json_object'):
+                result = message.message.json_object
+        elapsed = time.perf_counter() - start
+    finally:
+        done.set()
+        ticker.join()
+    if not result or not result.get("success"):
+        raise RuntimeError(f"转换失败: {result}")
+    if total_lengths and total_lengths != {len(blob)}:
+        raise RuntimeError(f"分块的 total_length {sorted(total_lengths)} 与文件长度 {len(blob)} 不一致")
+    return {"ttfb": first_byte, "seconds": elapsed, "stall": max(stalls, default=0.0), "blob": bytes(blob), "result": result}
+
+
+def save_peak_mb(data: dict, to_file: bool) -> float:
+    """写出阶段的峰值内存；分块输出与工具一致，直接写入临时文件"""
+    xmind_converter = XmindConverter()
+    workbook = xmind_converter.create_workbook()
+    xmind_converter.fill_sheet(workbook.getPrimarySheet(), "基准", data, 10)
+    tracemalloc.start()
+    if to_file:
+        with tempfile.TemporaryFile() as output:
+            xmind_converter.write_archive(workbook, output)
+    else:
+        xmind_converter.save(workbook)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modules', type=int, default=300, help='顶层模块数')
+    parser.add_argument('--fanout', type=int, default=20, help='每个模块下的用例数')
+    parser.add_argument('--repeat', type=int, default=3, help='每种方式的重复次数（取最快一次）')
+    args = parser.parse_args()
+
+    tool = Json2xmindTool.from_credentials({})
+    data = build_payload(args.modules, args.fanout)
+    json_data = json.dumps(data, ensure_ascii=False)
+    modes = [
+        ("buffered", {"deterministic": True}),
+        ("streamed", {"deterministic": True, "experimental_stream_output": True}),
+    ]
+
+    runs = {}
+    for name, params in modes:
+        runs[name] = min((measure(tool, json_data, params) for _ in range(args.repeat)), key=lambda run: run["seconds"])
+
+    nodes = runs["buffered"]["result"]["statistics"]["total_nodes"]
+    print(f"{nodes} nodes, input {len(json_data) / 1024:.0f} KB")
+    print(f"{'mode':<10} {'ttfb(s)':>8} {'total(s)':>9} {'max stall(s)':>13} {'save peak(MB)':>14} {'size(KB)':>9} {'chunks':>7}")
+    for name, _ in modes:
+        run = runs[name]
+        peak = save_peak_mb(data, name == "streamed")
+        print(f"{name:<10} {run['ttfb']:8.3f} {run['seconds']:9.3f} {run['stall']:13.3f} {peak:14.1f} "
+              f"{len(run['blob']) / 1024:9.1f} {run['result'].get('chunks', 1):7}")
+
+    buffered, streamed = runs["buffered"], runs["streamed"]
+    if buffered["blob"] != streamed["blob"] or buffered["result"]["content_hash"] != streamed["result"]["content_hash"]:
+        print("❌ 两种方式生成的文件不一致")
+        sys.exit(1)
+    if streamed["result"]["file_size"] != len(streamed["blob"]):
+        print("❌ 分块输出的 file_size 与收到的字节数不一致")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""XMind → JSON 提取吞吐基准
+
+生成指定大小的 content.xml（默认 50 MB，含标记、备注、链接和关系），
+然后完整调用一次 Xmind2jsonTool（提取、序列化并分块输出 JSON 文件），报告吞吐量与峰值内存。
+收到的分块写入临时文件后校验可解析，峰值内存不含校验阶段。
+
+用法: python benchmarks/bench_xmind2json.py [--size-mb 50] [--fanout 20]
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+import zipfile
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dify_plugin.entities.tool import ToolInvokeMessage  # noqa: E402
+
+from tools.xmind2json import Xmind2jsonTool  # noqa: E402
+
+HEADER = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<xmap-content xmlns="urn:xmind:xmap:xmlns:content:2.0" xmlns:xlink="http://www.w3.org/1999/xlink" '
+    'xmlns:svg="http://www.w3.org/2000/svg" version="2.0"><sheet id="sheet"><topic id="root"><title>基准</title>'
+    '<children><topics type="attached">'
+)
+
+
+def generate_xmind(path: str, size_mb: float, fanout: int) -> int:
+    """流式写出一个指定大小的 .xmind，返回主题数"""
+    target = int(size_mb * 1024 * 1024)
+    written = 0
+    topics = 1
+    module = 0
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        with archive.open('content.xml', 'w') as content:
+            def write(text: str):
+                nonlocal written
+                data = text.encode('utf-8')
+                content.write(data)
+                written += len(data)
+
+            write(HEADER)
+            while written < target:
+                module += 1
+                write(f'<topic id="m{module}"><title>模块 {module}</title>'
+                      f'<marker-refs><marker-ref marker-id="priority-{module % 6 + 1}"/></marker-refs>'
+                      '<children><topics type="attached">')
+                for case in range(fanout):
+                    href = f' xlink:href="xmind:#m{module - 1}"' if case == 0 and module > 1 else ''
+                    write(f'<topic id="m{module}c{case}"{href}><title>{escape(f"用例 {module}-{case}")}</title>'
+                          f'<marker-refs><marker-ref marker-id="star-red"/><marker-ref marker-id="task-half"/></marker-refs>'
+                          f'<notes><plain>{escape("前置条件与预期结果 " * 3)}</plain></notes></topic>')
+                topics += fanout + 1
+                write('</topics></children></topic>')
+            write('</topics></children></topic><title>Sheet</title><relationships>')
+            for i in range(1, min(module, 1000)):
+                write(f'<relationship id="r{i}" end1="m{i}" end2="m{i + 1}"><title>下一步</title></relationship>')
+            write('</relationships></sheet></xmap-content>')
+    return topics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size-mb', type=float, default=50, help='content.xml 的目标大小 (MB)')
+    parser.add_argument('--fanout', type=int, default=20, help='每个模块下的主题数')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'bench.xmind')
+        topics = generate_xmind(path, args.size_mb, args.fanout)
+        with zipfile.ZipFile(path) as archive:
+            xml_size = archive.getinfo('content.xml').file_size
+        archive_size = os.path.getsize(path)
+
+        tool = Xmind2jsonTool.from_credentials({})
+        output_path = os.path.join(temp_dir, 'bench.json')
+        result = None
+        chunks = 0
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        start = time.perf_counter()
+        with open(output_path, 'wb') as output:
+            for message in tool._invoke({"xmind_file": path}):
+                if isinstance(message.message, ToolInvokeMessage.BlobChunkMessage):
+                    output.write(message.message.blob)
+                    chunks += 1
+                    total_length = message.message.total_length
+                elif hasattr(message.message, 'json_object'):
+                    result = message.message.json_object
+        elapsed = time.perf_counter() - start
+        rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        output_size = os.path.getsize(output_path)
+
+        if not result or not result.get("success"):
+            print(f"❌ 转换失败: {result}")
+            sys.exit(1)
+        if output_size != total_length or output_size != result["file_size"]:
+            print(f"❌ 文件长度不一致: 收到 {output_size}, total_length {total_length}, file_size {result['file_size']}")
+            sys.exit(1)
+        with open(output_path, encoding='utf-8') as f:
+            json.load(f)
+
+    statistics = result["statistics"]
+    print(f"content.xml:  {xml_size / 1024 / 1024:.1f} MB (archive {archive_size / 1024 / 1024:.1f} MB)")
+    print(f"topics:       {topics} (extracted {statistics['total_topics']}, relations {statistics['relations']})")
+    print(f"output:       {output_size / 1024 / 1024:.1f} MB JSON in {chunks} chunks")
+    print(f"elapsed:      {elapsed:.2f} s (extraction {statistics['elapsed_seconds']:.2f} s)")
+    print(f"throughput:   {xml_size / 1024 / 1024 / elapsed:.1f} MB/s, {topics / elapsed:,.0f} topics/s")
+    # Linux 上 ru_maxrss 单位为 KB
+    print(f"peak RSS:     {rss_after / 1024:.1f} MB (+{(rss_after - rss_before) / 1024:.1f} MB during the call)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""自动格式识别回归检查
+
+input_format=auto 时，字符串输入依次尝试 JSON、Markdown 大纲、YAML、CSV 等解析器。本脚本用一组
+容易误判的样例校验识别结果，任一样例的解析结果与期望不符时以非零状态退出：
+  - 以 `#` 注释开头的 YAML 不能被当作 Markdown 标题
+  - 标题后接列表项、只有标题、标题后接段落的文本仍按大纲解析
+
+用法: python benchmarks/check_input_detection.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.json2xmind import Json2xmindTool  # noqa: E402
+
+# (说明, 输入文本, 期望的解析结果)
+CASES = [
+    (
+        "YAML 以注释开头",
+        "# project config\nname: demo\nowner: qa\nsettings:\n  debug: true",
+        {"name": "demo", "owner": "qa", "settings": {}, "debug": True},
+    ),
+    (
+        "YAML 多行注释后接无值的键",
+        "# 配置\n#\n# 说明\nsettings:\n  debug: true",
+        {"settings": {}, "debug": True},
+    ),
+    (
+        "标题后接列表项",
+        "# 项目\n- 需求: 登录\n- 设计",
+        {"项目": {"需求: 登录": {}, "设计": {}}},
+    ),
+    (
+        "只有标题",
+        "# 项目\n## 模块",
+        {"项目": {"模块": {}}},
+    ),
+    (
+        "标题后接段落",
+        "# 项目\n这是一段说明",
+        {"项目": {"_note": "这是一段说明"}},
+    ),
+]
+
+
+def main():
+    tool = Json2xmindTool.from_credentials({})
+    failures = []
+    for name, text, expected in CASES:
+        actual = tool._parse_input_data(text)
+        status = "ok" if actual == expected else "FAIL"
+        print(f"  {status:<4} {name}")
+        if actual != expected:
+            failures.append(f"{name}: 期望 {expected!r}，实际 {actual!r}")
+
+    if failures:
+        print("\n❌ 格式识别回归:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""主题样式往返回归检查
+
+json2xmind 把 _color/_text_color/_branch_color/_shape/_style 写成 styles.xml 中的共享样式，
+xmind2json 需要把主题的 style-id（旧版 content.xml）或 style.properties（XMind Zen content.json）
+还原为相同的元数据。本脚本校验：
+  - 带样式的 JSON → .xmind → JSON 后样式元数据与期望一致（颜色、形状、字体样式统一为英文别名）
+  - 还原的 JSON 再次转换为 .xmind 后 styles.xml 的样式属性与第一次相同
+  - 手工构造的 XMind Zen content.json 中的 style.properties 同样被还原
+任一检查不符时以非零状态退出。
+
+用法: python benchmarks/check_style_roundtrip.py
+"""
+import io
+import json
+import os
+import sys
+import zipfile
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.converter import XmindConverter  # noqa: E402
+from tools.xmind2json import Xmind2jsonTool  # noqa: E402
+
+STYLE_KEYS = ('_color', '_text_color', '_branch_color', '_shape', '_style')
+
+DATA = {
+    "登录": {
+        "_color": "红", "_text_color": "#fff", "_style": "粗体 斜体", "_shape": "椭圆",
+        "账号密码": {"_branch_color": "#3498db", "_style": "下划线,删除线"},
+        "扫码": {"_shape": "org.xmind.topicShape.starburst", "_color": "#123456"},
+    },
+    "支付": {"_color": "red", "_priority": 1, "余额": "通过"},
+    "退出": "无样式",
+}
+
+# 往返后的期望元数据（键为主题路径）
+EXPECTED = {
+    "登录": {"_color": "red", "_text_color": "white", "_style": "bold,italic", "_shape": "ellipse"},
+    "登录/账号密码": {"_branch_color": "blue", "_style": "underline,strikethrough"},
+    "登录/扫码": {"_shape": "org.xmind.topicShape.starburst", "_color": "#123456"},
+    "支付": {"_color": "red"},
+    "支付/余额": {},
+    "退出": {},
+}
+
+ZEN_CONTENT = [{
+    "id": "sheet", "title": "Zen",
+    "rootTopic": {
+        "id": "root", "title": "根",
+        "children": {"attached": [
+            {"id": "a", "title": "样式", "style": {"id": "s1", "properties": {
+                "svg:fill": "#2ECC71", "fo:color": "#333333", "fo:font-weight": "bold",
+                "fo:text-decoration": "line-through", "shape-class": "org.xmind.topicShape.roundedRect",
+            }}},
+            {"id": "b", "title": "空样式", "style": {"id": "s2", "properties": {}}},
+        ]},
+    },
+}]
+
+ZEN_EXPECTED = {
+    "样式": {"_color": "green", "_text_color": "#333333", "_style": "bold,strikethrough", "_shape": "rounded"},
+    "空样式": {},
+}
+
+
+def to_xmind(data: dict) -> bytes:
+    blob, _ = XmindConverter().convert(data, "样式", 10)
+    return blob
+
+
+def extract(blob: bytes) -> dict:
+    sheets = Xmind2jsonTool.from_credentials({})._extract_workbook(io.BytesIO(blob))
+    return sheets[0]["json_data"]
+
+
+def style_metadata(data: dict, prefix: str = "") -> dict:
+    """主题路径 → 样式元数据"""
+    result = {}
+    for key, value in data.items():
+        if key.startswith('_'):
+            continue
+        path = f"{prefix}{key}"
+        result[path] = {k: value[k] for k in STYLE_KEYS if k in value} if isinstance(value, dict) else {}
+        if isinstance(value, dict):
+            result.update(style_metadata(value, f"{path}/"))
+        elif value is not None and not isinstance(value, list):
+            result[f"{path}/{value}"] = {}
+    return result
+
+
+def style_properties(blob: bytes) -> list:
+    """styles.xml 中所有样式的属性组合（排序后比较，不依赖样式ID与顺序）"""
+    with zipfile.ZipFile(io.BytesIO(blob)) as archive:
+        root = ET.fromstring(archive.read('styles.xml'))
+    return sorted(sorted(elem.attrib.items()) for elem in root.iter() if elem.tag.endswith('topic-properties'))
+
+
+def report(name: str, errors: list, failures: list):
+    print(f"  {'FAIL' if errors else 'ok':<4} {name}")
+    failures.extend(errors)
+
+
+def compare(name: str, actual: dict, expected: dict, failures: list):
+    errors = [
+        f"{name} {path}: 期望 {metadata!r}，实际 {actual.get(path)!r}"
+        for path, metadata in expected.items() if actual.get(path) != metadata
+    ]
+    report(name, errors, failures)
+
+
+def main():
+    failures = []
+
+    first = to_xmind(DATA)
+    restored = extract(first)
+    compare("content.xml 样式还原", style_metadata(restored), EXPECTED, failures)
+
+    second = to_xmind(restored)
+    errors = []
+    if style_properties(first) != style_properties(second):
+        errors.append(f"再次转换后 styles.xml 不同: {style_properties(first)!r} != {style_properties(second)!r}")
+    report("再次转换的 styles.xml", errors, failures)
+
+    zen = io.BytesIO()
+    with zipfile.ZipFile(zen, 'w') as archive:
+        archive.writestr('content.json', json.dumps(ZEN_CONTENT, ensure_ascii=False))
+    compare("content.json style.properties 还原", style_metadata(extract(zen.getvalue())), ZEN_EXPECTED, failures)
+
+    if failures:
+        print("\n❌ 样式往返回归:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
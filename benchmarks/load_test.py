@@ -0,0 +1,326 @@
+"""本地插件守护进程替身与并发压测
+
+不依赖网络和 Dify 安装，按插件守护进程的调用协议驱动工具：
+每次调用新建 Session 与 ToolRuntime，经 Tool.invoke 转换参数后消费 _invoke 生成器，
+blob 消息按 8192 字节拆分为 BLOB_CHUNK，所有消息通过 SDK 的 ResponseWriter 序列化为
+守护进程会收到的 JSON 行（写入内存计数器而不是 stdio/TCP）。
+每个文件的 BLOB_CHUNK（SDK 拆分的和工具直接发送的）都按守护进程的方式重新拼接并校验：
+序号连续、每块的 total_length 都等于最终长度，拼出的 .xmind/.zip 可解压、.json 可解析。
+
+报告吞吐量、p50/p95/p99 延迟、首条消息耗时、每条消息的序列化开销，
+以及数千次调用过程中的 RSS 增长、打开的文件描述符和临时文件数（用于发现临时文件或 DOM 残留导致的泄漏）。
+
+用法: python benchmarks/load_test.py [--calls 2000] [--concurrency 8] [--tool json2xmind]
+"""
+import argparse
+import glob
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 导入 dify_plugin 时会执行 gevent 的 monkey.patch_all，这里的线程与守护进程中一样是协程
+from dify_plugin.core.runtime import Session  # noqa: E402
+from dify_plugin.core.server.__base.response_writer import ResponseWriter  # noqa: E402
+from dify_plugin.entities.tool import ToolInvokeMessage, ToolRuntime  # noqa: E402
+from dify_plugin.file.constants import DIFY_FILE_IDENTITY  # noqa: E402
+
+from tools.json2xmind import Json2xmindTool  # noqa: E402
+from tools.xmind2json import Xmind2jsonTool  # noqa: E402
+
+# 与 dify_plugin.plugin.Plugin 中拆分 blob 的块大小一致
+BLOB_CHUNK_SIZE = 8192
+
+
+class CountingWriter(ResponseWriter):
+    """只统计写出的消息数和字节数的响应写入器"""
+
+    def __init__(self):
+        self.messages = 0
+        self.bytes = 0
+
+    def write(self, data: str):
+        self.messages += 1
+        self.bytes += len(data)
+
+    def done(self):
+        pass
+
+
+class LocalDaemon:
+    """模拟守护进程的一次工具调用：构造工具、转换参数、拆分 blob 并序列化每条消息"""
+
+    def __init__(self, tool_cls: type, workers: int):
+        # 真实守护进程中所有会话共享同一个线程池
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.tool_cls = tool_cls
+
+    def invoke(self, parameters: dict) -> dict:
+        session_id = uuid.uuid4().hex
+        writer = CountingWriter()
+        session = Session(session_id=session_id, executor=self.executor, reader=None, writer=writer)
+        tool = self.tool_cls(runtime=ToolRuntime(credentials={}, user_id='load-test', session_id=session_id), session=session)
+
+        start = time.perf_counter()
+        first_message = None
+        serialize_seconds = 0.0
+        tool_messages = 0
+        blobs = {}
+        for message in tool.invoke(parameters):
+            if first_message is None:
+                first_message = time.perf_counter() - start
+            tool_messages += 1
+            serialize_start = time.perf_counter()
+            for wire_message in self._wire_messages(message):
+                writer.session_message(session_id=session_id, data=writer.stream_object(data=wire_message))
+                if wire_message.type == ToolInvokeMessage.MessageType.BLOB_CHUNK:
+                    self._merge_chunk(blobs, wire_message)
+            serialize_seconds += time.perf_counter() - serialize_start
+        elapsed = time.perf_counter() - start
+        unfinished = [blob_id for blob_id, state in blobs.items() if not state["done"]]
+        if unfinished:
+            raise AssertionError(f"{len(unfinished)} 个文件缺少结束分块")
+
+        return {
+            "elapsed": elapsed,
+            "first_message": first_message if first_message is not None else elapsed,
+            "serialize": serialize_seconds,
+            "tool_messages": tool_messages,
+            "wire_messages": writer.messages,
+            "wire_bytes": writer.bytes,
+        }
+
+    def _wire_messages(self, message: ToolInvokeMessage) -> list[ToolInvokeMessage]:
+        """与 Plugin._execute_request 相同的 blob 拆分：blob 消息拆为 BLOB_CHUNK，其余消息原样转发"""
+        if not isinstance(message.message, ToolInvokeMessage.BlobMessage):
+            return [message]
+
+        blob_id = uuid.uuid4().hex
+        blob = message.message.blob
+        chunks = [blob[i:i + BLOB_CHUNK_SIZE] for i in range(0, len(blob), BLOB_CHUNK_SIZE)]
+        return [
+            ToolInvokeMessage(
+                type=ToolInvokeMessage.MessageType.BLOB_CHUNK,
+                message=ToolInvokeMessage.BlobChunkMessage(
+                    id=blob_id, sequence=sequence, total_length=len(blob), blob=chunk, end=sequence == len(chunks),
+                ),
+                meta=message.meta,
+            )
+            for sequence, chunk in enumerate(chunks + [b""])
+        ]
+
+    def _merge_chunk(self, blobs: dict, message: ToolInvokeMessage):
+        """按守护进程合并分块的方式拼接文件，协议或内容不符时抛出 AssertionError"""
+        chunk = message.message
+        state = blobs.setdefault(chunk.id, {"data": bytearray(), "sequence": 0, "total_length": chunk.total_length, "done": False})
+        if state["done"]:
+            raise AssertionError(f"文件 {chunk.id} 在结束分块之后仍有分块")
+        if chunk.sequence != state["sequence"]:
+            raise AssertionError(f"文件 {chunk.id} 分块序号不连续: 期望 {state['sequence']}，收到 {chunk.sequence}")
+        if chunk.total_length != state["total_length"]:
+            raise AssertionError(f"文件 {chunk.id} 的 total_length 不一致: 首块 {state['total_length']}，第 {chunk.sequence} 块 {chunk.total_length}")
+        state["data"] += chunk.blob
+        state["sequence"] += 1
+        if not chunk.end:
+            return
+
+        state["done"] = True
+        data = bytes(state.pop("data"))
+        if len(data) != state["total_length"]:
+            raise AssertionError(f"文件 {chunk.id} 拼接后 {len(data)} 字节，与 total_length {state['total_length']} 不符")
+        filename = (message.meta or {}).get("filename", "")
+        if filename.endswith(('.xmind', '.zip')):
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                bad = archive.testzip()
+            if bad:
+                raise AssertionError(f"文件 {filename} 中的条目 {bad} 已损坏")
+        elif filename.endswith('.json'):
+            json.loads(data)
+
+def json2xmind_payloads() -> list[tuple[str, dict]]:
+    """典型工作流输入：小型配置、中型嵌套结构、Markdown 大纲、CSV、精简输出、流式输出和批量任务"""
+    small = {"项目": {"目标": "上线", "负责人": "张三", "_priority": 1}}
+    medium = {
+        f"模块{m}": {f"功能{f}": {"_task": "half", "_note": "验收标准", "步骤": [f"步骤{s}" for s in range(4)]} for f in range(8)}
+        for m in range(12)
+    }
+    outline = "\n".join(f"## 章节{c}\n" + "\n".join(f"- 要点 {c}-{p} [P{p % 3 + 1}]\n  - 细节" for p in range(6)) for c in range(10))
+    csv_text = "模块,用例,优先级\n" + "\n".join(f"模块{r % 7},用例{r},P{r % 3}" for r in range(300))
+    batch = [{"root_title": f"任务{i}", "json_data": small} for i in range(5)]
+    return [
+        ("small", {"json_data": json.dumps(small, ensure_ascii=False)}),
+        ("medium", {"json_data": json.dumps(medium, ensure_ascii=False), "root_title": "系统"}),
+        ("outline", {"json_data": outline, "input_format": "markdown"}),
+        ("csv", {"json_data": csv_text, "group_by": "模块"}),
+        ("compact", {"json_data": json.dumps(medium, ensure_ascii=False), "output_profile": "compact", "fold_leaves": True}),
+        ("stream", {"json_data": json.dumps(medium, ensure_ascii=False), "experimental_stream_output": True}),
+        ("batch", {"json_data": json.dumps(batch, ensure_ascii=False), "batch_mode": "workbook"}),
+    ]
+
+
+def xmind2json_payloads() -> list[tuple[str, dict]]:
+    """先用 json2xmind 生成若干 .xmind，再作为文件参数（Dify 文件对象字典）反向提取"""
+    daemon = LocalDaemon(Json2xmindTool, 1)
+    payloads = []
+    for name, parameters in json2xmind_payloads()[:4]:
+        tool = daemon.tool_cls.from_credentials({})
+        blob = next(m.message.blob for m in tool._invoke(dict(parameters)) if isinstance(m.message, ToolInvokeMessage.BlobMessage))
+        payloads.append((name, {"xmind_file": blob}))
+    return payloads
+
+
+def file_parameter(blob: bytes, filename: str) -> dict:
+    """构造守护进程传入的文件参数字典"""
+    return {"dify_model_identity": DIFY_FILE_IDENTITY, "url": "http://localhost/load-test", "type": "document",
+            "filename": filename, "extension": os.path.splitext(filename)[1], "size": len(blob)}
+
+
+def prepare_parameters(parameters: dict) -> dict:
+    """每次调用都复制参数；文件参数按 SDK 转换为 File 后预先注入内容，避免访问网络"""
+    prepared = {}
+    blobs = {}
+    for key, value in parameters.items():
+        if isinstance(value, bytes):
+            prepared[key] = file_parameter(value, "load-test.xmind")
+            blobs[key] = value
+        else:
+            prepared[key] = value
+    if not blobs:
+        return prepared
+
+    prepared = Json2xmindTool._convert_parameters(prepared)
+    for key, blob in blobs.items():
+        prepared[key]._blob = blob
+    return prepared
+
+
+def current_rss_mb() -> float:
+    """当前（而非峰值）RSS，单位 MB"""
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+
+
+def resource_snapshot() -> dict:
+    return {
+        "rss_mb": current_rss_mb(),
+        "fds": len(os.listdir('/proc/self/fd')),
+        "temp_files": len(glob.glob(os.path.join(tempfile.gettempdir(), '*'))),
+        "threads": threading.active_count(),
+    }
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def run_load(daemon: LocalDaemon, payloads: list[tuple[str, dict]], calls: int, concurrency: int, seed: int, sample_every: int):
+    """以固定并发驱动 calls 次调用，返回每次调用的结果和 RSS 采样"""
+    rng = random.Random(seed)
+    plan = [rng.choice(payloads) for _ in range(calls)]
+    results = []
+    samples = []
+    failures = []
+    lock = threading.Lock()
+    cursor = iter(enumerate(plan))
+
+    def worker():
+        while True:
+            with lock:
+                item = next(cursor, None)
+            if item is None:
+                return
+            index, (name, parameters) = item
+            try:
+                result = daemon.invoke(prepare_parameters(parameters))
+            except Exception as e:
+                with lock:
+                    failures.append((name, repr(e)))
+                continue
+            with lock:
+                results.append((name, result))
+                if len(results) % sample_every == 0:
+                    samples.append((len(results), current_rss_mb()))
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, samples, failures
+
+
+def report(results: list, samples: list, failures: list, wall: float, before: dict, warm: dict, after: dict):
+    latencies = [r["elapsed"] for _, r in results]
+    firsts = [r["first_message"] for _, r in results]
+    wire_messages = sum(r["wire_messages"] for _, r in results)
+    serialize = sum(r["serialize"] for _, r in results)
+
+    print(f"calls:              {len(results)} ok, {len(failures)} failed in {wall:.2f} s")
+    print(f"throughput:         {len(results) / wall:.1f} calls/s")
+    print(f"latency:            p50 {percentile(latencies, 50) * 1000:.1f} ms, p95 {percentile(latencies, 95) * 1000:.1f} ms, "
+          f"p99 {percentile(latencies, 99) * 1000:.1f} ms, max {max(latencies) * 1000:.1f} ms")
+    print(f"first message:      p50 {percentile(firsts, 50) * 1000:.2f} ms, p99 {percentile(firsts, 99) * 1000:.2f} ms")
+    print(f"wire messages:      {wire_messages} ({wire_messages / len(results):.1f}/call), "
+          f"{sum(r['wire_bytes'] for _, r in results) / 1024 / 1024:.1f} MB")
+    print(f"per-message cost:   {serialize / wire_messages * 1e6:.1f} us serialization "
+          f"({serialize / sum(latencies):.1%} of invoke time)")
+
+    print("\nper payload:")
+    for name in sorted({n for n, _ in results}):
+        subset = [r for n, r in results if n == name]
+        values = [r["elapsed"] for r in subset]
+        print(f"  {name:<10} n={len(subset):<5} p50 {percentile(values, 50) * 1000:7.1f} ms  p99 {percentile(values, 99) * 1000:7.1f} ms  "
+              f"{sum(r['tool_messages'] for r in subset) / len(subset):.0f} msgs/call")
+
+    print("\nresources (start → after warmup → end):")
+    for key in before:
+        print(f"  {key:<11} {before[key]:>8.1f} → {warm[key]:>8.1f} → {after[key]:>8.1f}")
+    if len(samples) >= 2:
+        (first_calls, first_rss), (last_calls, last_rss) = samples[0], samples[-1]
+        per_call = (last_rss - first_rss) * 1024 / max(1, last_calls - first_calls)
+        print(f"  RSS slope  {per_call:+.2f} KB/call over calls {first_calls}-{last_calls}")
+    for name, error in failures[:5]:
+        print(f"  failure    {name}: {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tool', choices=['json2xmind', 'xmind2json'], default='json2xmind')
+    parser.add_argument('--calls', type=int, default=2000, help='总调用次数')
+    parser.add_argument('--concurrency', type=int, default=8, help='同时进行的调用数')
+    parser.add_argument('--warmup', type=int, default=50, help='正式计时前的预热调用数')
+    parser.add_argument('--seed', type=int, default=0, help='负载组合的随机种子')
+    args = parser.parse_args()
+
+    tool_cls = Json2xmindTool if args.tool == 'json2xmind' else Xmind2jsonTool
+    payloads = json2xmind_payloads() if args.tool == 'json2xmind' else xmind2json_payloads()
+    daemon = LocalDaemon(tool_cls, args.concurrency)
+
+    before = resource_snapshot()
+    run_load(daemon, payloads, args.warmup, args.concurrency, args.seed + 1, max(1, args.warmup))
+    warm = resource_snapshot()
+
+    start = time.perf_counter()
+    results, samples, failures = run_load(daemon, payloads, args.calls, args.concurrency, args.seed, max(1, args.calls // 20))
+    wall = time.perf_counter() - start
+    after = resource_snapshot()
+
+    if not results:
+        print(f"all {len(failures)} calls failed: {failures[:3]}")
+        sys.exit(1)
+    report(results, samples, failures, wall, before, warm, after)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,291 @@
+"""内存上限回归测试
+
+manifest.yaml 中 resource.memory 规定了插件可用的内存（256 MB），插件进程与转换进程池的工作进程共用这一配额。
+本脚本对每种输入形态，在子进程中按生产路径调用 json2xmind（达到 POOL_MIN_NODES 的任务提交到转换进程池），
+二分查找能成功转换的最大输入规模，并记录该规模下的进程树峰值内存、节点数和输入大小：
+  - wide：单层大字典          - deep：多条深层嵌套链（max_depth=20）
+  - array：超长数组           - metadata：每个节点带全套元数据
+  - yaml / csv：非 JSON 文本，经自动识别回退到 YAML/CSV 解析
+
+容器按整个 cgroup 计费，因此探针运行期间每隔 --poll-ms 汇总探针进程及其全部子进程的 PSS
+（/proc/<pid>/smaps_rollup，fork 出的工作进程与父进程共享的页面只计一次），合计超过上限即结束整个进程树，
+视为 OOM 失败。逐进程的 RLIMIT_AS 无法约束多个进程的合计，这里不再使用。
+轮询可能错过两次采样之间极短的峰值，结果是实际上限的略微偏乐观的估计。超时同样视为失败。
+
+结果与基线文件比较，任一形态的最大规模低于基线超过 --tolerance 时以非零状态退出；
+--update-baseline 将本次结果写为新基线。
+
+用法: python benchmarks/memory_ceiling.py [--shapes wide,csv] [--tolerance 0.1] [--update-baseline]
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+import yaml
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "memory_ceiling_baseline.json")
+
+# 子进程探针：读入参数文件（与守护进程传入的 json_data 字符串一致），输出一行 CEILING 结果
+PROBE = r'''
+import json, os, sys
+from tools import converter
+from tools.json2xmind import Json2xmindTool
+with open(sys.argv[1], encoding="utf-8") as f:
+    parameters = json.load(f)
+result = None
+for message in Json2xmindTool.from_credentials({})._invoke(parameters):
+    if hasattr(message.message, "json_object"):
+        result = message.message.json_object
+print("CEILING " + json.dumps({
+    "success": bool(result and result.get("success")),
+    "error_type": (result or {}).get("error_type"),
+    "nodes": ((result or {}).get("statistics") or {}).get("total_nodes"),
+    # 转换进程池只在遇到达到 POOL_MIN_NODES 的任务时创建
+    "pooled": converter._converter_pool is not None,
+}), flush=True)
+os._exit(0)
+'''
+
+
+def wide_payload(size: int) -> dict:
+    return {"json_data": json.dumps({f"键{i}": f"值{i}" for i in range(size)}, ensure_ascii=False)}
+
+
+def deep_payload(size: int) -> dict:
+    def chain(branch: int) -> dict:
+        node = {"叶子": branch}
+        for level in range(17, 0, -1):
+            node = {f"层{level}": node, "说明": f"分支{branch}-{level}"}
+        return node
+    return {"json_data": json.dumps({f"分支{b}": chain(b) for b in range(size)}, ensure_ascii=False), "max_depth": 20}
+
+
+def array_payload(size: int) -> dict:
+    return {"json_data": json.dumps([f"条目 {i}" for i in range(size)], ensure_ascii=False)}
+
+
+def metadata_payload(size: int) -> dict:
+    data = {
+        f"任务{i}": {"_priority": i % 6 + 1, "_star": "red", "_flag": "green", "_task": "half", "_emotion": "smile",
+                   "_note": "前置条件与预期结果", "_label": "回归", "_url": "https://example.com", "_folded": i % 2 == 0,
+                   "负责人": f"成员{i % 17}", "工时": i % 8}
+        for i in range(size)
+    }
+    return {"json_data": json.dumps(data, ensure_ascii=False)}
+
+
+def yaml_payload(size: int) -> dict:
+    return {"json_data": "\n".join(f"分组{i}:\n  名称: 项目 {i}\n  状态: 进行中" for i in range(size))}
+
+
+def csv_payload(size: int) -> dict:
+    return {"json_data": "模块,用例,结果\n" + "\n".join(f"模块{i % 97},用例{i},通过" for i in range(size)), "group_by": "模块"}
+
+
+# 形态 → (负载生成函数, 初始规模)
+SHAPES = {
+    "wide": (wide_payload, 2000),
+    "deep": (deep_payload, 100),
+    "array": (array_payload, 2000),
+    "metadata": (metadata_payload, 500),
+    "yaml": (yaml_payload, 1000),
+    "csv": (csv_payload, 2000),
+}
+
+
+def manifest_memory_limit() -> int:
+    with open(os.path.join(ROOT, "manifest.yaml"), encoding="utf-8") as f:
+        return int(yaml.safe_load(f)["resource"]["memory"])
+
+
+def _process_tree(root: int) -> list[int]:
+    """root 及其全部后代进程的进程号（扫描 /proc/<pid>/stat 中的父进程号）"""
+    children: dict[int, list[int]] = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', encoding='utf-8') as f:
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    tree = [root]
+    for pid in tree:
+        tree.extend(children.get(pid, ()))
+    return tree
+
+
+def _process_memory(pid: int) -> int:
+    """进程的 PSS 字节数；内核不提供 smaps_rollup 时退回 VmRSS，进程已退出时为 0"""
+    for path, key in ((f'/proc/{pid}/smaps_rollup', 'Pss:'), (f'/proc/{pid}/status', 'VmRSS:')):
+        try:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    if line.startswith(key):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            continue
+    return 0
+
+
+def _kill_tree(pids: list[int]):
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except OSError:
+            pass
+
+
+def probe(parameters: dict, limit: int, timeout: float, poll_interval: float) -> dict:
+    """在子进程中转换一次并轮询进程树内存；合计超过 limit、崩溃或超时都视为失败"""
+    with tempfile.NamedTemporaryFile('w', suffix='.json', encoding='utf-8', delete=False) as f:
+        json.dump(parameters, f, ensure_ascii=False)
+    input_bytes = len(parameters["json_data"].encode('utf-8'))
+    error = None
+    peak = 0
+    start = time.perf_counter()
+    # 插件日志写到 stdout，重定向到临时文件，避免管道写满阻塞探针
+    with tempfile.TemporaryFile('w+', encoding='utf-8') as stdout, tempfile.TemporaryFile('w+', encoding='utf-8') as stderr:
+        process = subprocess.Popen([sys.executable, "-c", PROBE, f.name], cwd=ROOT, stdout=stdout, stderr=stderr, text=True)
+        try:
+            while process.poll() is None:
+                tree = _process_tree(process.pid)
+                peak = max(peak, sum(_process_memory(pid) for pid in tree))
+                if peak > limit:
+                    error = "OOMKilled"
+                elif time.perf_counter() - start > timeout:
+                    error = "Timeout"
+                if error:
+                    _kill_tree(tree)
+                    process.wait()
+                    break
+                time.sleep(poll_interval)
+        finally:
+            os.unlink(f.name)
+            if process.poll() is None:
+                _kill_tree(_process_tree(process.pid))
+                process.wait()
+        stdout.seek(0)
+        stderr.seek(0)
+        output, errors = stdout.read(), stderr.read()
+
+    result = {"success": False, "error_type": error}
+    if error is None:
+        for line in output.splitlines():
+            if line.startswith("CEILING "):
+                result = json.loads(line[len("CEILING "):])
+                break
+        else:
+            if "MemoryError" in errors:
+                result["error_type"] = "MemoryError"
+            elif process.returncode < 0:
+                result["error_type"] = signal.Signals(-process.returncode).name
+            else:
+                result["error_type"] = f"exit {process.returncode}"
+    result.update({"input_bytes": input_bytes, "peak_bytes": peak, "seconds": time.perf_counter() - start})
+    return result
+
+
+def _report(shape: str, size: int, result: dict):
+    status = 'ok' if result['success'] else result['error_type']
+    print(f"  {shape:<9} size={size:<9} {status:<12} {result['peak_bytes'] / 1024 / 1024:6.1f} MB {result['seconds']:6.1f}s", flush=True)
+
+
+def find_ceiling(shape: str, limit: int, precision: float, max_size: int, timeout: float, poll_interval: float) -> dict:
+    """倍增找到首个失败的规模，再二分到相对精度 precision，返回最大成功规模及其探针结果"""
+    make_payload, size = SHAPES[shape]
+    best = None
+    failed = None
+    while size <= max_size:
+        result = probe(make_payload(size), limit, timeout, poll_interval)
+        _report(shape, size, result)
+        if not result["success"]:
+            failed = (size, result)
+            break
+        best = (size, result)
+        size *= 2
+
+    if best is None:
+        return {"max_size": 0, "error_type": failed[1]["error_type"]}
+    if failed is not None:
+        low, high = best[0], failed[0]
+        while (high - low) / low > precision:
+            size = (low + high) // 2
+            result = probe(make_payload(size), limit, timeout, poll_interval)
+            _report(shape, size, result)
+            if result["success"]:
+                low, best = size, (size, result)
+            else:
+                high, failed = size, (size, result)
+
+    size, result = best
+    return {
+        "max_size": size,
+        "nodes": result["nodes"],
+        "input_bytes": result["input_bytes"],
+        "peak_mb": round(result["peak_bytes"] / 1024 / 1024, 1),
+        "pooled": result["pooled"],
+        "seconds": round(result["seconds"], 1),
+        # 达到 --max-size 仍未失败时，真实上限更高
+        "limited_by": failed[1]["error_type"] if failed else "max_size",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--shapes', default=','.join(SHAPES), help='要测试的输入形态，逗号分隔')
+    parser.add_argument('--precision', type=float, default=0.05, help='二分查找的相对精度')
+    parser.add_argument('--tolerance', type=float, default=0.1, help='允许最大规模低于基线的比例')
+    parser.add_argument('--max-size', type=int, default=4_000_000, help='规模上限，达到后停止倍增')
+    parser.add_argument('--timeout', type=float, default=120, help='单次探针超时 (秒)')
+    parser.add_argument('--poll-ms', type=float, default=10, help='进程树内存的采样间隔 (毫秒)')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='基线文件路径')
+    parser.add_argument('--update-baseline', action='store_true', help='将本次结果写为新基线')
+    args = parser.parse_args()
+
+    limit = manifest_memory_limit()
+    shapes = [shape.strip() for shape in args.shapes.split(',') if shape.strip()]
+    unknown = [shape for shape in shapes if shape not in SHAPES]
+    if unknown:
+        parser.error(f"未知的输入形态: {', '.join(unknown)}")
+
+    print(f"memory limit {limit / 1024 / 1024:.0f} MB (process tree PSS, from manifest.yaml)")
+    results = {shape: find_ceiling(shape, limit, args.precision, args.max_size, args.timeout, args.poll_ms / 1000) for shape in shapes}
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f).get("shapes", {})
+
+    print(f"\n{'shape':<9} {'max size':>9} {'baseline':>9} {'nodes':>8} {'input(KB)':>10} {'peak(MB)':>9} {'pooled':>6}  limited by")
+    regressions = []
+    for shape, result in results.items():
+        expected = baseline.get(shape, {}).get("max_size")
+        print(f"{shape:<9} {result['max_size']:>9} {expected if expected is not None else '-':>9} {result.get('nodes') or 0:>8} "
+              f"{(result.get('input_bytes') or 0) / 1024:>10.0f} {result.get('peak_mb') or 0:>9.1f} {str(result.get('pooled', '-')):>6}  "
+              f"{result.get('limited_by') or result.get('error_type')}")
+        if expected and result["max_size"] < expected * (1 - args.tolerance):
+            regressions.append(f"{shape}: {result['max_size']} < 基线 {expected}")
+
+    if args.update_baseline:
+        baseline.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({"memory_limit": limit, "shapes": baseline}, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"\n基线已更新: {os.path.relpath(args.baseline, ROOT)}")
+    elif regressions:
+        print("\n❌ 支持的输入规模低于基线:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,11 @@
+import threading
+
 from dify_plugin import Plugin, DifyPluginEnv
 
 plugin = Plugin(DifyPluginEnv(MAX_REQUEST_TIMEOUT=120))
 
 if __name__ == '__main__':
+    # 转换依赖延迟导入；插件开始运行后在后台预先导入，首个请求无需再等待。转换进程池仍在首次遇到大任务时才创建
+    from tools.converter import preload
+    threading.Thread(target=preload, daemon=True).start()
     plugin.run()
@@ -0,0 +1,1107 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, BinaryIO, Iterator
+import hashlib
+import io
+import logging
+import os
+import re
+import threading
+import time
+import zipfile
+from itertools import islice
+from xml.dom import Node
+from xml.sax.saxutils import escape
+
+from dify_plugin.config.logger_format import plugin_logger_handler
+
+# xmind（minidom）与进程池相关模块在首次使用时才导入，不计入插件冷启动时间
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+    from xmind.core.topic import TopicElement
+
+# 设置插件专用日志
+plugin_logger = logging.getLogger(__name__)
+plugin_logger.setLevel(logging.INFO)
+plugin_logger.addHandler(plugin_logger_handler)
+
+# 确定性输出：固定的时间戳与zip条目时间
+DETERMINISTIC_TIMESTAMP = "0"
+DETERMINISTIC_ZIP_TIME = (1980, 1, 1, 0, 0, 0)
+# 引用主题/样式ID的属性，确定性模式下需与ID一同重写
+ID_REFERENCE_ATTRIBUTES = ('end1', 'end2', 'style-id', 'object-id')
+
+# 主题样式：命名颜色（含中文别名）→ 色值，也可直接填写 #RGB/#RRGGBB
+NAMED_COLORS = {
+    'red': '#E74C3C', 'orange': '#F39C12', 'yellow': '#F1C40F', 'green': '#2ECC71', 'blue': '#3498DB',
+    'purple': '#9B59B6', 'pink': '#FF69B4', 'gray': '#95A5A6', 'grey': '#95A5A6', 'black': '#000000', 'white': '#FFFFFF',
+    '红': '#E74C3C', '橙': '#F39C12', '黄': '#F1C40F', '绿': '#2ECC71', '蓝': '#3498DB',
+    '紫': '#9B59B6', '粉': '#FF69B4', '灰': '#95A5A6', '黑': '#000000', '白': '#FFFFFF',
+}
+HEX_COLOR_RE = re.compile(r'^#?([0-9a-fA-F]{3}|[0-9a-fA-F]{6})$')
+# 形状别名 → XMind 的 shape-class
+TOPIC_SHAPES = {
+    'rect': 'org.xmind.topicShape.rectangle', 'rectangle': 'org.xmind.topicShape.rectangle', '矩形': 'org.xmind.topicShape.rectangle',
+    'rounded': 'org.xmind.topicShape.roundedRect', 'roundedrect': 'org.xmind.topicShape.roundedRect', '圆角矩形': 'org.xmind.topicShape.roundedRect',
+    'ellipse': 'org.xmind.topicShape.ellipse', '椭圆': 'org.xmind.topicShape.ellipse',
+    'circle': 'org.xmind.topicShape.circle', '圆形': 'org.xmind.topicShape.circle',
+    'diamond': 'org.xmind.topicShape.diamond', '菱形': 'org.xmind.topicShape.diamond',
+    'underline': 'org.xmind.topicShape.underline', '下划线': 'org.xmind.topicShape.underline',
+    'parallelogram': 'org.xmind.topicShape.parallelogram', '平行四边形': 'org.xmind.topicShape.parallelogram',
+    'cloud': 'org.xmind.topicShape.cloud', '云朵': 'org.xmind.topicShape.cloud',
+}
+SHAPE_CLASS_PREFIX = 'org.xmind.topicShape.'
+# 字体样式别名 → (topic-properties 属性, 取值)；下划线与删除线合并写入 fo:text-decoration
+FONT_STYLES = {
+    'bold': ('fo:font-weight', 'bold'), '粗体': ('fo:font-weight', 'bold'), '加粗': ('fo:font-weight', 'bold'),
+    'italic': ('fo:font-style', 'italic'), '斜体': ('fo:font-style', 'italic'),
+    'underline': ('fo:text-decoration', 'underline'), '下划线': ('fo:text-decoration', 'underline'),
+    'strikethrough': ('fo:text-decoration', 'line-through'), '删除线': ('fo:text-decoration', 'line-through'),
+}
+TEXT_DECORATIONS = ('underline', 'line-through')
+STYLE_SEPARATORS_RE = re.compile(r'[\s,，、+|/]+')
+
+# 写出 .xmind 时 XML 文本按批编码后写入 zip 条目
+SERIALIZE_BATCH_SIZE = 64 * 1024
+# minidom 转义文本和属性值时额外处理双引号
+XML_QUOTE_ENTITIES = {'"': '&quot;'}
+
+# 转换进程池：节点数不少于阈值的任务交给后台进程，较小的任务直接在调用线程中转换
+POOL_MIN_NODES = 2000
+# 进程池大小上限；每个工作进程各自持有一份 DOM，受插件内存上限约束，默认不超过 2 个
+POOL_MAX_WORKERS = int(os.environ.get('JSON2XMIND_POOL_WORKERS') or 2)
+
+
+class XmindConverter:
+    """JSON → XMind 转换核心
+    
+    每个实例只服务于一次转换（或一个批量工作簿），所有中间状态都挂在实例上，
+    不依赖 Tool 实例、全局可变状态或固定的文件路径，因此可在多个线程或进程中并发使用。
+    """
+    
+    def __init__(self, deterministic: bool = False, compact: bool = False, fold_leaves: bool = False):
+        self._deterministic = deterministic
+        # 精简输出选项：省略冗余的空值备注、将简短的基础类型值折叠进标题
+        self._compact = compact
+        self._fold_leaves = fold_leaves
+        # 标题/路径 → 主题ID 索引，以及待解析的 _topic/_relations 引用；仅在填充一个工作表期间有效
+        self._topic_index: dict[str, str] | None = None
+        self._pending_links: list[tuple] | None = None
+        # 父主题节点 → 其 topics 容器，仅在填充一个工作表期间有效（见 _add_sub_topic）
+        self._topic_containers: dict | None = None
+        # 共享样式表：样式属性组合 → styles.xml 中的样式ID，随实例所服务的工作簿一同存在（见 _apply_style）
+        self._style_ids: dict[tuple, str] = {}
+        self._styles_element = None
+        self._depth_limit_logged = False
+        # 只构建主题树时的展示截断：剩余可创建的主题数、截断层的回调，仅在 build_tree 期间有效
+        self._node_budget: int | None = None
+        self._omitted_nodes = 0
+        self._on_truncated = None
+    
+    @classmethod
+    def from_options(cls, options: dict) -> "XmindConverter":
+        """从工具参数/批量默认值字典创建转换器，忽略与输出无关的键"""
+        return cls(
+            deterministic=bool(options.get("deterministic", False)),
+            compact=bool(options.get("compact", False)),
+            fold_leaves=bool(options.get("fold_leaves", False)),
+        )
+    
+    def convert(self, data: Any, root_title: str, max_depth: int, sheet_title: str = "JSON转换结果") -> tuple[bytes, dict]:
+        """将解析后的数据转换为单工作表的 .xmind，返回 (文件内容, 统计信息)"""
+        workbook, statistics = self._build_workbook(data, root_title, max_depth, sheet_title)
+        return self.save(workbook), statistics
+    
+    def convert_to_file(self, data: Any, root_title: str, max_depth: int, path: str, sheet_title: str = "JSON转换结果") -> dict:
+        """与 convert 相同，但把 .xmind 直接写入 path，不在内存中保留 zip 文件，返回统计信息"""
+        workbook, statistics = self._build_workbook(data, root_title, max_depth, sheet_title)
+        with open(path, 'wb') as output:
+            self.write_archive(workbook, output)
+        return statistics
+    
+    def _build_workbook(self, data: Any, root_title: str, max_depth: int, sheet_title: str) -> tuple[Any, dict]:
+        """创建单工作表的工作簿并写入数据，返回 (工作簿, 统计信息)"""
+        workbook = self.create_workbook()
+        sheet = workbook.getPrimarySheet()
+        sheet.setTitle(sheet_title)
+        return workbook, self.fill_sheet(sheet, root_title, data, max_depth)
+    
+    def _apply_metadata(self, topic: TopicElement, data: dict):
+        """应用元数据到XMind主题，支持完整的元数据标记系统"""
+        
+        # 优先级 (1-6) - 增强兼容性
+        if '_priority' in data:
+            priority = data['_priority']
+            # 支持字符串和整数输入
+            try:
+                priority_int = int(priority)
+                if 1 <= priority_int <= 6:
+                    topic.addMarker(f'priority-{priority_int}')
+            except (ValueError, TypeError):
+                pass
+        
+        # 描述标签 - 增强格式处理
+        if '_label' in data:
+            current_title = topic.getTitle() or ""
+            label = str(data['_label']).strip()
+            if label:
+                # 避免重复添加标签
+                if f"({label})" not in current_title:
+                    topic.setTitle(f"{current_title} ({label})")
+        
+        # 备注 - 支持多行和富文本
+        if '_note' in data:
+            note_content = str(data['_note']).strip()
+            if note_content:
+                topic.setPlainNotes(note_content)
+        
+        # 星标 - 增加兼容性和默认值
+        if '_star' in data:
+            star_color = str(data['_star']).lower().strip()
+            valid_star_colors = ['red', 'orange', 'yellow', 'blue', 'green', 'purple', 'default']
+            if star_color in valid_star_colors:
+                topic.addMarker(f'star-{star_color}')
+            elif star_color == 'true' or star_color == '1':  # 兼容布尔值
+                topic.addMarker('star-yellow')  # 默认黄色星标
+        
+        # 旗帜 - 增加兼容性
+        if '_flag' in data:
+            flag_color = str(data['_flag']).lower().strip()
+            valid_flag_colors = ['red', 'orange', 'yellow', 'blue', 'green', 'purple', 'default']
+            if flag_color in valid_flag_colors:
+                topic.addMarker(f'flag-{flag_color}')
+            elif flag_color == 'true' or flag_color == '1':  # 兼容布尔值
+                topic.addMarker('flag-red')  # 默认红色旗帜
+        
+        # 任务进度 - 增加别名支持
+        if '_task' in data:
+            task_progress = str(data['_task']).lower().strip()
+            # 支持多种表达方式
+            task_mapping = {
+                'start': 'start', 'begin': 'start', '0%': 'start', '开始': 'start',
+                'oct': 'oct', '12.5%': 'oct', '1/8': 'oct',
+                'quarter': 'quarter', '25%': 'quarter', '1/4': 'quarter', '四分之一': 'quarter',
+                '3oct': '3oct', '37.5%': '3oct', '3/8': '3oct',
+                'half': 'half', '50%': 'half', '1/2': 'half', '一半': 'half',
+                '5oct': '5oct', '62.5%': '5oct', '5/8': '5oct',
+                '3quar': '3quar', '75%': '3quar', '3/4': '3quar', '四分之三': '3quar',
+                '7oct': '7oct', '87.5%': '7oct', '7/8': '7oct',
+                'done': 'done', 'complete': 'done', '100%': 'done', '完成': 'done'
+            }
+            if task_progress in task_mapping:
+                topic.addMarker(f'task-{task_mapping[task_progress]}')
+        
+        # 表情 - 增加别名支持
+        if '_emotion' in data:
+            emotion = str(data['_emotion']).lower().strip()
+            emotion_mapping = {
+                'smile': 'smile', 'happy': 'smile', '😊': 'smile', '微笑': 'smile',
+                'laugh': 'laugh', 'joy': 'laugh', '😂': 'laugh', '大笑': 'laugh',
+                'angry': 'angry', 'mad': 'angry', '😠': 'angry', '生气': 'angry',
+                'cry': 'cry', 'sad': 'cry', '😢': 'cry', '哭泣': 'cry',
+                'surprise': 'surprise', 'shocked': 'surprise', '😲': 'surprise', '惊讶': 'surprise',
+                'boring': 'boring', 'tired': 'boring', '😴': 'boring', '无聊': 'boring'
+            }
+            if emotion in emotion_mapping:
+                topic.addMarker(f'smiley-{emotion_mapping[emotion]}')
+        
+        # 符号 - 增加别名支持
+        if '_symbol' in data:
+            symbol = str(data['_symbol']).lower().strip()
+            symbol_mapping = {
+                'plus': 'plus', 'add': 'plus', '+': 'plus', '加号': 'plus',
+                'minus': 'minus', 'subtract': 'minus', '-': 'minus', '减号': 'minus',
+                'question': 'question', '?': 'question', '问号': 'question',
+                'exclam': 'exclam', 'exclamation': 'exclam', '!': 'exclam', '感叹号': 'exclam',
+                'info': 'info', 'information': 'info', 'i': 'info', '信息': 'info',
+                'wrong': 'wrong', 'error': 'wrong', 'x': 'wrong', '错误': 'wrong',
+                'right': 'right', 'correct': 'right', 'check': 'right', '正确': 'right'
+            }
+            if symbol in symbol_mapping:
+                topic.addMarker(f'symbol-{symbol_mapping[symbol]}')
+        
+        # 箭头 - 增加更多方向支持
+        if '_arrow' in data:
+            arrow = str(data['_arrow']).lower().strip()
+            arrow_mapping = {
+                'up': 'up', 'north': 'up', '↑': 'up', '上': 'up',
+                'up-right': 'up-right', 'northeast': 'up-right', '↗': 'up-right', '右上': 'up-right',
+                'right': 'right', 'east': 'right', '→': 'right', '右': 'right',
+                'down-right': 'down-right', 'southeast': 'down-right', '↘': 'down-right', '右下': 'down-right',
+                'down': 'down', 'south': 'down', '↓': 'down', '下': 'down',
+                'down-left': 'down-left', 'southwest': 'down-left', '↙': 'down-left', '左下': 'down-left',
+                'left': 'left', 'west': 'left', '←': 'left', '左': 'left',
+                'up-left': 'up-left', 'northwest': 'up-left', '↖': 'up-left', '左上': 'up-left',
+                'refresh': 'refresh', 'reload': 'refresh', '🔄': 'refresh', '刷新': 'refresh'
+            }
+            if arrow in arrow_mapping:
+                topic.addMarker(f'arrow-{arrow_mapping[arrow]}')
+        
+        # 超链接 - 增强URL验证和处理
+        if '_url' in data:
+            url = str(data['_url']).strip()
+            if url:
+                # 简单URL格式验证和修正
+                if not url.startswith(('http://', 'https://', 'ftp://', 'file://')):
+                    if '.' in url:  # 看起来像域名
+                        url = 'https://' + url
+                topic.setURLHyperlink(url)
+        elif '_file' in data:
+            file_path = str(data['_file']).strip()
+            if file_path:
+                topic.setFileHyperlink(file_path)
+        elif '_topic' in data:
+            topic_link = str(data['_topic']).strip()
+            if topic_link:
+                # 先登记，待整棵树构建完成后按标题/路径索引解析为主题ID
+                if self._pending_links is not None:
+                    self._pending_links.append(('topic', topic, topic_link, None))
+                else:
+                    topic.setTopicHyperlink(topic_link)
+        
+        # 关系连线 - 支持字符串、列表以及 {"target": ..., "title": ...} 格式
+        if '_relations' in data and self._pending_links is not None:
+            relations = data['_relations']
+            if not isinstance(relations, list):
+                relations = [relations]
+            for relation in relations:
+                if isinstance(relation, dict):
+                    target = relation.get('target') or relation.get('to')
+                    rel_title = relation.get('title') or relation.get('label')
+                else:
+                    target, rel_title = relation, None
+                if target is not None and str(target).strip():
+                    self._pending_links.append(('relation', topic, str(target).strip(), str(rel_title) if rel_title else None))
+        
+        # 折叠状态 - 支持多种表达方式
+        if '_folded' in data:
+            folded_value = data['_folded']
+            # 支持布尔值、字符串、数字
+            if isinstance(folded_value, bool):
+                is_folded = folded_value
+            elif isinstance(folded_value, str):
+                is_folded = folded_value.lower() in ['true', '1', 'yes', 'on', '是', '折叠']
+            elif isinstance(folded_value, (int, float)):
+                is_folded = bool(folded_value)
+            else:
+                is_folded = False
+            
+            if is_folded:
+                topic.setFolded()
+        
+        # 位置设置 - 增强格式兼容性
+        if '_position' in data:
+            position = data['_position']
+            x, y = None, None
+            
+            try:
+                if isinstance(position, (list, tuple)) and len(position) >= 2:
+                    x, y = float(position[0]), float(position[1])
+                elif isinstance(position, str):
+                    # 支持 "x,y" 格式
+                    if ',' in position:
+                        coords = position.split(',')
+                        if len(coords) >= 2:
+                            x, y = float(coords[0].strip()), float(coords[1].strip())
+                elif isinstance(position, dict):
+                    # 支持 {"x": 100, "y": 200} 格式
+                    if 'x' in position and 'y' in position:
+                        x, y = float(position['x']), float(position['y'])
+                
+                if x is not None and y is not None:
+                    topic.setPosition(int(x), int(y))
+            except (ValueError, TypeError, IndexError):
+                pass  # 忽略无效的位置数据
+        
+        # 主题样式：填充色、文字颜色、字体样式、形状和分支线颜色合并为一个共享样式
+        style_properties = self._style_properties(data)
+        if style_properties:
+            self._apply_style(topic, style_properties)
+    
+    def _style_properties(self, data: dict) -> dict[str, str]:
+        """从 _color/_text_color/_branch_color/_shape/_style 元数据得到 topic-properties 属性，无法识别的取值忽略"""
+        properties = {}
+        for key, attribute in (('_color', 'svg:fill'), ('_text_color', 'fo:color'), ('_branch_color', 'line-color')):
+            if key in data:
+                color = self._parse_color(data[key])
+                if color:
+                    properties[attribute] = color
+        
+        if '_shape' in data:
+            shape = str(data['_shape']).strip()
+            # 别名之外也接受 XMind 的形状类名（xmind2json 对没有别名的形状原样输出）
+            shape = shape if shape.startswith(SHAPE_CLASS_PREFIX) else TOPIC_SHAPES.get(shape.lower())
+            if shape:
+                properties['shape-class'] = shape
+        
+        if '_style' in data:
+            # 支持 "bold,italic"、"粗体 斜体" 等组合写法及列表
+            values = data['_style'] if isinstance(data['_style'], list) else STYLE_SEPARATORS_RE.split(str(data['_style']))
+            decorations = set()
+            for value in values:
+                font_style = FONT_STYLES.get(str(value).lower().strip())
+                if font_style is None:
+                    continue
+                attribute, style_value = font_style
+                if attribute == 'fo:text-decoration':
+                    decorations.add(style_value)
+                else:
+                    properties[attribute] = style_value
+            if decorations:
+                properties['fo:text-decoration'] = ' '.join(d for d in TEXT_DECORATIONS if d in decorations)
+        
+        return properties
+    
+    def _parse_color(self, value: Any) -> str | None:
+        """命名颜色或十六进制色值 → 大写的 #RRGGBB，便于相同颜色的不同写法共用一个样式"""
+        color = str(value).strip()
+        named = NAMED_COLORS.get(color.lower())
+        if named:
+            return named
+        match = HEX_COLOR_RE.match(color)
+        if not match:
+            return None
+        digits = match.group(1)
+        if len(digits) == 3:
+            digits = ''.join(digit * 2 for digit in digits)
+        return f"#{digits.upper()}"
+    
+    def _apply_style(self, topic: TopicElement, properties: dict[str, str]):
+        """为主题设置共享样式
+        
+        相同的属性组合在 styles.xml 中只写一个 <style>，主题只设置 style-id 引用，不读取或改写主题已有的内容；
+        样式ID由属性组合哈希得到。预览树等非 DOM 主题直接记录属性。
+        """
+        if not hasattr(topic, 'getImplementation'):
+            topic.setStyleProperties(properties)
+            return
+        
+        key = tuple(sorted(properties.items()))
+        style_id = self._style_ids.get(key)
+        if style_id is None:
+            style_id = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:26]
+            document = topic.getOwnerWorkbook().stylesbook.getOwnerDocument()
+            if self._styles_element is None:
+                self._styles_element = document.createElement('styles')
+                document.documentElement.appendChild(self._styles_element)
+            style = document.createElement('style')
+            style.setAttribute('id', style_id)
+            style.setAttribute('type', 'topic')
+            topic_properties = document.createElement('topic-properties')
+            for name, value in key:
+                topic_properties.setAttribute(name, value)
+            style.appendChild(topic_properties)
+            self._styles_element.appendChild(style)
+            self._style_ids[key] = style_id
+        topic.setAttribute('style-id', style_id)
+    
+    def _convert_json_to_xmind(self, data: Any, parent_topic: TopicElement, max_depth: int = 10, current_depth: int = 0, parent_path: str = ''):
+        """递归转换JSON为XMind主题结构，增强错误处理和格式兼容性"""
+        
+        # 安全检查；每个转换器只记录一次，避免在截断层逐节点输出日志
+        if current_depth >= max_depth:
+            if self._on_truncated is not None:
+                self._summarize_truncated(parent_topic, data)
+            elif not self._depth_limit_logged:
+                plugin_logger.warning(f"达到最大递归深度 {max_depth}，停止处理")
+                self._depth_limit_logged = True
+            return
+            
+        if data is None:
+            return
+        
+        try:
+            if isinstance(data, dict):
+                # 分离元数据和内容数据
+                metadata = {k: v for k, v in data.items() if k.startswith('_')}
+                content = {k: v for k, v in data.items() if not k.startswith('_')}
+                
+                # 如果有元数据，安全地应用到当前主题
+                if metadata:
+                    try:
+                        self._apply_metadata(parent_topic, metadata)
+                    except MemoryError:
+                        raise
+                    except Exception as e:
+                        plugin_logger.warning(f"应用元数据失败: {e}")
+                
+                # 处理内容数据
+                for index, (key, value) in enumerate(content.items()):
+                    if self._node_budget is not None and not self._take_node_budget():
+                        self._skip_nodes(islice(content.values(), index, None))
+                        break
+                    try:
+                        # 清理和验证键名
+                        clean_key = self._clean_node_title(str(key))
+                        if not clean_key:
+                            clean_key = f"节点{len(parent_topic.getSubTopics()) + 1}"
+                        
+                        child_topic = self._add_sub_topic(parent_topic)
+                        child_topic.setTitle(clean_key)
+                        child_path = self._register_topic(child_topic, clean_key, parent_path)
+                        
+                        if value is None:
+                            # null值：只创建节点，添加特殊标记
+                            if not self._compact:
+                                child_topic.setPlainNotes("空值")
+                            continue
+                        elif self._can_fold_leaf(value):
+                            # 折叠模式：简短的值直接并入标题，不再单独创建子节点
+                            child_topic.setTitle(self._clean_node_title(f"{clean_key}: {value}"))
+                            self._handle_leaf_value(child_topic, value, folded=True)
+                        elif isinstance(value, (dict, list)):
+                            # 复杂类型：继续递归
+                            self._convert_json_to_xmind(value, child_topic, max_depth, current_depth + 1, child_path)
+                        else:
+                            # 基础类型：创建子节点或直接设置内容
+                            self._handle_leaf_value(child_topic, value)
+                    except MemoryError:
+                        # 内存耗尽时不再逐节点写入错误主题，直接中止转换，避免返回残缺的导图
+                        raise
+                    except Exception as e:
+                        plugin_logger.error(f"处理键 '{key}' 时出错: {e}")
+                        # 创建错误节点以保持数据完整性
+                        error_topic = self._add_sub_topic(parent_topic)
+                        error_topic.setTitle(f"错误: {key}")
+                        error_topic.setPlainNotes(f"处理失败: {str(e)}")
+            
+            elif isinstance(data, list):
+                # 数组：为每个元素创建同级子主题
+                for i, item in enumerate(data):
+                    if self._node_budget is not None and not self._take_node_budget():
+                        self._skip_nodes(islice(data, i, None))
+                        break
+                    try:
+                        child_topic = self._add_sub_topic(parent_topic)
+                        
+                        # 智能命名数组项
+                        folded = self._can_fold_leaf(item)
+                        if folded:
+                            # 折叠模式：简短的值本身就是标题
+                            title = self._clean_node_title(str(item)) or f"项目 {i+1}"
+                        elif isinstance(item, dict) and item:
+                            # 尝试从字典中提取有意义的标题
+                            title = self._extract_meaningful_title(item, i)
+                        elif isinstance(item, str) and len(item) <= 50:
+                            # 短字符串直接作为标题
+                            title = self._clean_node_title(item)
+                        else:
+                            # 默认编号
+                            title = f"项目 {i+1}"
+                        
+                        child_topic.setTitle(title)
+                        child_path = self._register_topic(child_topic, title, parent_path)
+                        
+                        if isinstance(item, (dict, list)):
+                            self._convert_json_to_xmind(item, child_topic, max_depth, current_depth + 1, child_path)
+                        else:
+                            self._handle_leaf_value(child_topic, item, folded=folded)
+                    except MemoryError:
+                        raise
+                    except Exception as e:
+                        plugin_logger.error(f"处理数组项 {i} 时出错: {e}")
+                        # 创建错误节点
+                        error_topic = self._add_sub_topic(parent_topic)
+                        error_topic.setTitle(f"错误项目 {i+1}")
+                        error_topic.setPlainNotes(f"处理失败: {str(e)}")
+            
+            else:
+                # 基础类型：直接处理
+                self._handle_leaf_value(parent_topic, data)
+                
+        except MemoryError:
+            raise
+        except Exception as e:
+            plugin_logger.error(f"转换过程中发生严重错误: {e}")
+            # 添加错误信息到思维导图中
+            error_topic = self._add_sub_topic(parent_topic)
+            error_topic.setTitle("转换错误")
+            error_topic.setPlainNotes(f"数据转换失败: {str(e)}")
+    
+    def build_tree(self, topic: Any, data: Any, depth_limit: int, warn_on_limit: bool = True,
+                   node_limit: int | None = None, on_truncated: Any = None) -> int:
+        """把数据转换为 topic 之下的主题树，不创建工作簿，供预览等只需要主题结构的场景使用
+        
+        达到 depth_limit 层时与生成 .xmind 相同，不再处理更深的数据；warn_on_limit 为 False 时不记录深度告警。
+        传入 on_truncated 时 depth_limit 是调用方的展示截断：截断层的主题照常应用自身元数据，
+        未展开的子节点数通过 on_truncated(主题, 子节点数) 报告。node_limit 限制按先序创建的主题数，
+        用尽后剩余数据只估算节点数、不再创建主题。返回因 node_limit 省略的节点数。
+        """
+        self._depth_limit_logged = not warn_on_limit
+        self._node_budget = node_limit
+        self._omitted_nodes = 0
+        self._on_truncated = on_truncated
+        try:
+            self._convert_json_to_xmind(data, topic, depth_limit)
+            return self._omitted_nodes
+        finally:
+            self._node_budget = None
+            self._on_truncated = None
+    
+    def _take_node_budget(self) -> bool:
+        """占用一个主题名额，名额已用尽时返回 False"""
+        if self._node_budget <= 0:
+            return False
+        self._node_budget -= 1
+        return True
+    
+    def _skip_nodes(self, values: Iterator[Any]):
+        """主题名额用尽：剩余的兄弟节点及其子孙只估算数量，每个键/元素及其非空的基础类型值各计一个主题"""
+        count = 0
+        stack = [values]
+        while stack:
+            for value in stack.pop():
+                if isinstance(value, dict):
+                    count += 1
+                    stack.append([v for k, v in value.items() if not str(k).startswith('_')])
+                elif isinstance(value, list):
+                    count += 1
+                    stack.append(value)
+                else:
+                    count += 1 if value is None else 2
+        self._omitted_nodes += count
+    
+    def _summarize_truncated(self, topic: TopicElement, data: Any):
+        """展示截断层：应用主题自身的元数据，子节点只报告数量"""
+        if isinstance(data, dict):
+            metadata = {k: v for k, v in data.items() if k.startswith('_')}
+            if metadata:
+                try:
+                    self._apply_metadata(topic, metadata)
+                except MemoryError:
+                    raise
+                except Exception as e:
+                    plugin_logger.warning(f"应用元数据失败: {e}")
+            hidden = len(data) - len(metadata)
+        elif isinstance(data, list):
+            hidden = len(data)
+        else:
+            return
+        if hidden:
+            self._on_truncated(topic, hidden)
+    
+    def _add_sub_topic(self, parent_topic: TopicElement) -> TopicElement:
+        """追加一个子主题
+        
+        xmind 的 addSubTopic 每次都会把已有的兄弟主题逐个重新包装（并改写时间戳），宽节点的构建耗时随子节点数平方增长；
+        这里在首次追加后缓存父主题的 topics 容器，之后直接追加新主题。预览树等非 DOM 主题仍走 addSubTopic。
+        """
+        if self._topic_containers is None or not hasattr(parent_topic, 'getImplementation'):
+            return parent_topic.addSubTopic()
+        
+        parent_node = parent_topic.getImplementation()
+        container = self._topic_containers.get(parent_node)
+        if container is None:
+            topic = parent_topic.addSubTopic()
+            self._topic_containers[parent_node] = topic.getParentNode()
+            return topic
+        
+        topic = type(parent_topic)(None, parent_topic.getOwnerWorkbook())
+        container.appendChild(topic.getImplementation())
+        return topic
+    
+    def _register_topic(self, topic: TopicElement, title: str, parent_path: str) -> str:
+        """将主题登记到标题/路径索引中，返回该主题的路径"""
+        path = f"{parent_path}/{title}" if parent_path else title
+        if self._topic_index is not None and title:
+            topic_id = topic.getID()
+            # 同名标题以首次出现为准，路径则唯一定位
+            self._topic_index.setdefault(title, topic_id)
+            self._topic_index[path] = topic_id
+        return path
+    
+    def _resolve_topic_links(self, sheet: Any, root_title: str) -> dict:
+        """整棵树构建完成后，通过哈希索引一次性解析 _topic 链接和 _relations 连线"""
+        stats = {"links_resolved": 0, "links_unresolved": 0}
+        if not self._pending_links:
+            return stats
+        
+        root_prefix = f"{root_title}/"
+        for kind, topic, ref, rel_title in self._pending_links:
+            key = ref[1:] if ref.startswith('#') else ref
+            key = '/'.join(part.strip() for part in key.split('/'))
+            if key.startswith(root_prefix):
+                key = key[len(root_prefix):]
+            target_id = self._topic_index.get(key)
+            
+            try:
+                if kind == 'topic':
+                    # 无法解析时按原样写入，兼容直接填写主题ID的旧用法
+                    topic.setTopicHyperlink(target_id or ref)
+                elif target_id:
+                    sheet.createRelationship(topic.getID(), target_id, rel_title)
+            except Exception as e:
+                plugin_logger.warning(f"处理主题引用 '{ref}' 失败: {e}")
+                target_id = None
+            
+            if target_id:
+                stats["links_resolved"] += 1
+            else:
+                stats["links_unresolved"] += 1
+                plugin_logger.warning(f"未找到引用的主题: {ref}")
+        
+        return stats
+    
+    def _clean_node_title(self, title: str) -> str:
+        """清理节点标题，确保XMind兼容性"""
+        if not title:
+            return ""
+        
+        # 移除控制字符和特殊字符
+        cleaned = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', str(title))
+        
+        # 限制长度，避免显示问题
+        if len(cleaned) > 100:
+            cleaned = cleaned[:97] + "..."
+        
+        # 移除首尾空白
+        return cleaned.strip()
+    
+    def _extract_meaningful_title(self, item: dict, index: int) -> str:
+        """从字典中提取有意义的标题"""
+        # 常见的标题字段
+        title_fields = ['title', 'name', 'label', '标题', '名称', '名字', 'id', 'key']
+        
+        for field in title_fields:
+            if field in item:
+                title = self._clean_node_title(str(item[field]))
+                if title:
+                    return title
+        
+        # 如果没有找到标题字段，使用第一个字符串值
+        for key, value in item.items():
+            if isinstance(value, str) and len(value) <= 50:
+                title = self._clean_node_title(value)
+                if title:
+                    return f"{title}"
+        
+        # 默认编号
+        return f"项目 {index+1}"
+    
+    def _can_fold_leaf(self, value: Any) -> bool:
+        """折叠模式下，简短的基础类型值可以并入父节点标题"""
+        return self._fold_leaves and value is not None and not isinstance(value, (dict, list)) and len(str(value)) <= 100
+    
+    def _handle_leaf_value(self, topic: TopicElement, value: Any, folded: bool = False):
+        """处理叶子节点的值，增强类型支持；folded 为 True 时值已并入标题，只补充标记"""
+        try:
+            if value is None:
+                if not self._compact:
+                    topic.setPlainNotes("空值")
+                return
+            
+            # 转换为字符串
+            str_value = str(value)
+            
+            # 对于简短的值，直接作为子节点
+            if folded:
+                pass
+            elif len(str_value) <= 100:
+                leaf_topic = self._add_sub_topic(topic)
+                leaf_topic.setTitle(self._clean_node_title(str_value))
+            else:
+                # 对于长文本，放在备注中
+                topic.setPlainNotes(str_value[:500] + ("..." if len(str_value) > 500 else ""))
+                
+            # 根据值类型添加额外信息
+            if isinstance(value, bool):
+                topic.addMarker('symbol-right' if value else 'symbol-wrong')
+            elif isinstance(value, (int, float)):
+                if isinstance(value, int) and value > 0:
+                    # 为正数添加正面标记
+                    topic.addMarker('symbol-plus')
+                elif isinstance(value, (int, float)) and value < 0:
+                    # 为负数添加负面标记
+                    topic.addMarker('symbol-minus')
+            elif isinstance(value, str):
+                # 检测URL
+                if value.startswith(('http://', 'https://', 'ftp://')):
+                    topic.setURLHyperlink(value)
+                    topic.addMarker('symbol-info')
+                # 检测邮箱
+                elif '@' in value and '.' in value:
+                    topic.addMarker('symbol-info')
+                    
+        except MemoryError:
+            raise
+        except Exception as e:
+            plugin_logger.error(f"处理叶子值时出错: {e}")
+            # 安全处理：至少创建一个节点
+            try:
+                leaf_topic = self._add_sub_topic(topic)
+                leaf_topic.setTitle("数据处理错误")
+                leaf_topic.setPlainNotes(f"原值: {str(value)[:100]}, 错误: {str(e)}")
+            except:
+                pass  # 如果连错误节点都创建不了，就忽略
+    
+    def create_workbook(self) -> Any:
+        """创建带有必要子文档的空XMind工作簿；不设置路径，保存时完全在内存中进行"""
+        # 直接使用WorkbookDocument创建新的工作簿
+        try:
+            from xmind.core.workbook import WorkbookDocument
+            from xmind.core.styles import StylesBookDocument
+            from xmind.core.comments import CommentsBookDocument
+            
+            workbook = WorkbookDocument()
+            # 初始化必要的子文档
+            workbook.stylesbook = StylesBookDocument()
+            workbook.commentsbook = CommentsBookDocument()
+            
+            if workbook.getPrimarySheet() is None:
+                raise ValueError("无法获取主工作表")
+            # 共享样式表属于新的 styles.xml
+            self._style_ids = {}
+            self._styles_element = None
+        except ImportError as e:
+            raise Exception(f"XMind库导入失败，请确保已正确安装xmind库: {str(e)}")
+        except Exception as e:
+            raise Exception(f"创建XMind工作簿失败: {str(e)}")
+        return workbook
+    
+    def fill_sheet(self, sheet: Any, root_title: str, data: Any, max_depth: int) -> dict:
+        """将解析后的数据写入工作表的根主题，返回统计信息"""
+        root_topic = sheet.getRootTopic()
+        if root_topic is None:
+            raise ValueError("无法获取根主题")
+        root_topic.setTitle(root_title)
+        
+        self._topic_index = {root_title: root_topic.getID()}
+        self._pending_links = []
+        self._topic_containers = {}
+        try:
+            self._convert_json_to_xmind(data, root_topic, max_depth)
+            link_stats = self._resolve_topic_links(sheet, root_title)
+        finally:
+            self._topic_index = None
+            self._pending_links = None
+            self._topic_containers = None
+        
+        return {
+            "total_nodes": self._count_nodes(root_topic),
+            "max_depth_used": min(max_depth, self._calculate_depth(data)),
+            "root_title": root_title,
+            **link_stats
+        }
+    
+    def _count_nodes(self, topic: TopicElement) -> int:
+        """统计主题及其所有子主题的数量"""
+        count = 1
+        sub_topics = topic.getSubTopics()
+        if sub_topics:
+            for sub_topic in sub_topics:
+                count += self._count_nodes(sub_topic)
+        return count
+    
+    def save(self, workbook: Any) -> bytes:
+        """在内存中写出 .xmind 并返回文件内容，不经过临时文件（见 write_archive）"""
+        buffer = io.BytesIO()
+        self.write_archive(workbook, buffer)
+        return buffer.getvalue()
+    
+    def write_archive(self, workbook: Any, output: BinaryIO):
+        """将工作簿写为 .xmind（zip）到可 seek 的二进制文件对象；save 与 convert_to_file 共用，输出字节一致
+        
+        XML 按段序列化、分批写入 zip 条目，不会生成完整的 XML 文本。
+        deterministic：稳定ID、固定时间戳、排序属性，以及固定顺序和时间的zip条目，保证字节级可复现；
+        compact：去掉时间戳和未使用的命名空间声明，省略空的 styles.xml/comments.xml，并压缩zip条目。
+        """
+        deterministic = self._deterministic
+        compact = self._compact
+        if deterministic:
+            self._make_deterministic(workbook)
+        if compact:
+            self._strip_workbook(workbook)
+        
+        parts = [('content.xml', workbook)]
+        for name, document, item_tag in (('styles.xml', workbook.stylesbook, 'style'), ('comments.xml', workbook.commentsbook, 'comment')):
+            if not compact or document.getOwnerDocument().getElementsByTagName(item_tag):
+                parts.append((name, document))
+        
+        compression = zipfile.ZIP_DEFLATED if compact else zipfile.ZIP_STORED
+        with zipfile.ZipFile(output, 'w', compression) as archive:
+            for name, document in parts:
+                entry = zip_entry(name, deterministic)
+                entry.compress_type = compression
+                with archive.open(entry, 'w') as stream:
+                    batch = []
+                    batch_size = 0
+                    for fragment in iter_xml(document.getOwnerDocument()):
+                        batch.append(fragment)
+                        batch_size += len(fragment)
+                        if batch_size >= SERIALIZE_BATCH_SIZE:
+                            stream.write(''.join(batch).encode('utf-8'))
+                            batch = []
+                            batch_size = 0
+                    stream.write(''.join(batch).encode('utf-8'))
+    
+    def _strip_workbook(self, workbook: Any):
+        """移除时间戳属性以及根元素上未被使用的命名空间声明"""
+        root = workbook.getOwnerDocument().documentElement
+        used_prefixes = set()
+        stack = [root]
+        while stack:
+            element = stack.pop()
+            if element.hasAttribute('timestamp'):
+                element.removeAttribute('timestamp')
+            if ':' in element.tagName:
+                used_prefixes.add(element.tagName.split(':', 1)[0])
+            for name in element.attributes.keys():
+                if ':' in name and not name.startswith('xmlns:'):
+                    used_prefixes.add(name.split(':', 1)[0])
+            stack.extend(child for child in element.childNodes if child.nodeType == Node.ELEMENT_NODE)
+        
+        for name in list(root.attributes.keys()):
+            if name.startswith('xmlns:') and name[len('xmlns:'):] not in used_prefixes:
+                root.removeAttribute(name)
+    
+    def _make_deterministic(self, workbook: Any):
+        """将工作簿中所有随机ID替换为由结构路径和标题派生的稳定哈希，并固定时间戳、排序属性"""
+        documents = [workbook.getOwnerDocument(), workbook.stylesbook.getOwnerDocument(), workbook.commentsbook.getOwnerDocument()]
+        id_map = {}
+        elements = []
+        
+        # 第一遍：按 文档序号/标签[同名序号] 的结构路径生成新ID
+        for doc_index, document in enumerate(documents):
+            if document.documentElement is None:
+                continue
+            stack = [(document.documentElement, str(doc_index))]
+            while stack:
+                element, path = stack.pop()
+                elements.append(element)
+                old_id = element.getAttribute('id')
+                if old_id:
+                    title = ""
+                    for child in element.childNodes:
+                        if child.nodeType == Node.ELEMENT_NODE and child.tagName == 'title':
+                            title = "".join(text.data for text in child.childNodes if text.nodeType == Node.TEXT_NODE)
+                            break
+                    id_map[old_id] = hashlib.sha1(f"{path}|{title}".encode('utf-8')).hexdigest()[:26]
+                
+                counters = {}
+                for child in element.childNodes:
+                    if child.nodeType == Node.ELEMENT_NODE:
+                        index = counters.get(child.tagName, 0)
+                        counters[child.tagName] = index + 1
+                        stack.append((child, f"{path}/{child.tagName}[{index}]"))
+        
+        # 第二遍：重写ID及其引用、固定时间戳，并按名称排序属性
+        for element in elements:
+            attributes = []
+            for name, value in element.attributes.items():
+                if name == 'id' or name in ID_REFERENCE_ATTRIBUTES:
+                    value = id_map.get(value, value)
+                elif name == 'timestamp':
+                    value = DETERMINISTIC_TIMESTAMP
+                elif name == 'xlink:href' and value.startswith('xmind:#'):
+                    value = 'xmind:#' + id_map.get(value[len('xmind:#'):], value[len('xmind:#'):])
+                attributes.append((name, value))
+            for name, _ in attributes:
+                element.removeAttribute(name)
+            for name, value in sorted(attributes):
+                element.setAttribute(name, value)
+    
+    def _calculate_depth(self, data: Any, current_depth: int = 0) -> int:
+        """计算JSON数据的最大深度"""
+        if not isinstance(data, (dict, list)):
+            return current_depth
+        
+        max_child_depth = current_depth
+        
+        if isinstance(data, dict):
+            for key, value in data.items():
+                if not str(key).startswith('_'):  # 忽略元数据字段
+                    child_depth = self._calculate_depth(value, current_depth + 1)
+                    max_child_depth = max(max_child_depth, child_depth)
+        elif isinstance(data, list):
+            for item in data:
+                child_depth = self._calculate_depth(item, current_depth + 1)
+                max_child_depth = max(max_child_depth, child_depth)
+        
+        return max_child_depth
+
+
+def archive_summary(path: str) -> dict:
+    """已写出的 .xmind 文件的大小、SHA-256 和解压后的总大小，与整体输出返回的同名字段含义一致"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+        file_size = f.tell()
+    with zipfile.ZipFile(path) as archive:
+        uncompressed = sum(info.file_size for info in archive.infolist())
+    return {"file_size": file_size, "content_hash": digest.hexdigest(), "uncompressed_size": uncompressed}
+
+
+def uncompressed_size(file_content: bytes) -> int:
+    """读取zip中央目录，统计各条目解压后的总大小"""
+    try:
+        with zipfile.ZipFile(io.BytesIO(file_content)) as archive:
+            return sum(info.file_size for info in archive.infolist())
+    except zipfile.BadZipFile:
+        return len(file_content)
+
+
+def iter_xml(document: Any) -> Iterator[str]:
+    """按 minidom Document.writexml（无缩进、utf-8 声明）的格式逐段生成XML文本，输出与 xmind 的 Document.output 一致"""
+    yield '<?xml version="1.0" encoding="utf-8"?>'
+    # 栈中的字符串是待输出的结束标签
+    stack = list(reversed(document.childNodes))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            yield node
+        elif node.nodeType == Node.ELEMENT_NODE:
+            attributes = ''.join(f' {name}="{escape(value, XML_QUOTE_ENTITIES)}"' for name, value in node.attributes.items())
+            if not node.childNodes:
+                yield f'<{node.tagName}{attributes}/>'
+                continue
+            yield f'<{node.tagName}{attributes}>'
+            stack.append(f'</{node.tagName}>')
+            stack.extend(reversed(node.childNodes))
+        elif node.nodeType == Node.TEXT_NODE:
+            yield escape(node.data, XML_QUOTE_ENTITIES)
+        else:
+            # 注释、处理指令等少见节点直接交给 minidom
+            stream = io.StringIO()
+            node.writexml(stream)
+            yield stream.getvalue()
+
+
+def zip_entry(name: str, deterministic: bool) -> zipfile.ZipInfo:
+    """创建zip条目；确定性模式下固定修改时间和文件属性，否则与 writestr 按名称创建的条目相同"""
+    if not deterministic:
+        entry = zipfile.ZipInfo(name, date_time=time.localtime(time.time())[:6])
+        entry.external_attr = 0o600 << 16
+        return entry
+    entry = zipfile.ZipInfo(name, date_time=DETERMINISTIC_ZIP_TIME)
+    entry.create_system = 3
+    entry.external_attr = 0o644 << 16
+    return entry
+
+
+def estimate_nodes(data: Any, limit: int = POOL_MIN_NODES) -> int:
+    """粗略估算数据将生成的节点数，达到 limit 后提前返回"""
+    count = 0
+    stack = [data]
+    while stack and count < limit:
+        item = stack.pop()
+        if isinstance(item, dict):
+            count += len(item)
+            stack.extend(value for value in item.values() if isinstance(value, (dict, list)))
+        elif isinstance(item, list):
+            count += len(item)
+            stack.extend(value for value in item if isinstance(value, (dict, list)))
+    return count
+
+
+def convert_in_worker(data: Any, root_title: str, max_depth: int, options: dict) -> tuple[bytes, dict]:
+    """进程池入口：在工作进程中用独立的转换器完成转换"""
+    return XmindConverter.from_options(options).convert(data, root_title, max_depth)
+
+
+def convert_file_in_worker(data: Any, root_title: str, max_depth: int, options: dict, path: str) -> dict:
+    """进程池入口：在工作进程中转换并把 .xmind 写入 path"""
+    return XmindConverter.from_options(options).convert_to_file(data, root_title, max_depth, path)
+
+
+def convert(data: Any, root_title: str, max_depth: int, options: dict) -> tuple[bytes, dict, bool]:
+    """转换单个导图：大任务提交到进程池，小任务或进程池不可用时在当前线程转换
+    
+    返回 (文件内容, 统计信息, 是否在进程池中完成)。
+    """
+    (file_content, statistics), pooled = _run_conversion(convert_in_worker, data, root_title, max_depth, options)
+    return file_content, statistics, pooled
+
+
+def convert_to_file(data: Any, root_title: str, max_depth: int, options: dict, path: str) -> tuple[dict, bool]:
+    """与 convert 相同，但把 .xmind 写入 path（插件进程与工作进程都能访问的文件），文件内容不经过进程间管道
+    
+    返回 (统计信息, 是否在进程池中完成)。
+    """
+    return _run_conversion(convert_file_in_worker, data, root_title, max_depth, options, path)
+
+
+def _run_conversion(function: Any, data: Any, *args: Any) -> tuple[Any, bool]:
+    """节点数达到 POOL_MIN_NODES 时在进程池中执行 function(data, *args)，否则或进程池不可用时在当前线程执行"""
+    if estimate_nodes(data) >= POOL_MIN_NODES:
+        from concurrent.futures.process import BrokenProcessPool
+        
+        executor = get_converter_pool()
+        if executor is not None:
+            try:
+                return executor.submit(function, data, *args).result(), True
+            except BrokenProcessPool as e:
+                plugin_logger.warning(f"⚠️ 转换进程池不可用，改为在当前线程转换: {e}")
+                _reset_converter_pool()
+    
+    return function(data, *args), False
+
+
+# 转换进程池：跨调用复用，不在每次调用后关闭
+# （gevent 补丁下 shutdown(wait=True) 会因 join 管理线程而报 LoopExit）
+_converter_pool: ProcessPoolExecutor | None = None
+_converter_pool_lock = threading.Lock()
+
+
+def _init_worker(parent_pid: int):
+    """工作进程初始化：父进程退出时随之退出
+    
+    fork 出的工作进程继承了任务管道的两端，父进程被强制结束后读不到 EOF，会一直阻塞成为孤儿进程。
+    """
+    import ctypes
+    import signal
+    
+    try:
+        # Linux prctl(PR_SET_PDEATHSIG, SIGKILL)
+        ctypes.CDLL(None, use_errno=True).prctl(1, signal.SIGKILL)
+    except (OSError, AttributeError):
+        pass
+    if os.getppid() != parent_pid:
+        os._exit(0)
+
+
+def _warm_up() -> int:
+    """预热任务：让工作进程提前启动，返回进程号"""
+    return os.getpid()
+
+
+def get_converter_pool() -> ProcessPoolExecutor | None:
+    """获取共享的转换进程池；首次调用时创建并预热全部工作进程，无法创建时返回 None"""
+    global _converter_pool
+    from concurrent.futures import ProcessPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+    
+    with _converter_pool_lock:
+        if _converter_pool is None:
+            workers = max(1, min(os.cpu_count() or 1, POOL_MAX_WORKERS))
+            try:
+                _converter_pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(os.getpid(),))
+                # 每次提交在没有空闲进程时都会启动一个新进程，提交 workers 个空任务即可全部拉起
+                for _ in range(workers):
+                    _converter_pool.submit(_warm_up)
+            except (OSError, BrokenProcessPool) as e:
+                plugin_logger.warning(f"⚠️ 无法创建转换进程池: {e}")
+                _converter_pool = None
+                return None
+            plugin_logger.info(f"⚙️ 转换进程池已启动: {workers} 个工作进程")
+        return _converter_pool
+
+
+def preload():
+    """导入转换时才用到的 xmind 模块，由插件启动后的后台线程调用，使首个请求无需再承担导入开销
+    
+    不创建转换进程池：工作进程常驻并占用插件的内存配额，只在首次遇到大任务时由 get_converter_pool 创建。
+    """
+    from xmind.core.comments import CommentsBookDocument  # noqa: F401
+    from xmind.core.styles import StylesBookDocument  # noqa: F401
+    from xmind.core.topic import TopicElement  # noqa: F401
+    from xmind.core.workbook import WorkbookDocument  # noqa: F401
+
+
+def _reset_converter_pool():
+    """丢弃已损坏的进程池，下次使用时重新创建"""
+    global _converter_pool
+    with _converter_pool_lock:
+        if _converter_pool is not None:
+            _converter_pool.shutdown(wait=False)
+        _converter_pool = None
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import uuid
+from typing import Any, BinaryIO, Iterator
+
+import httpx
+from dify_plugin.entities.tool import ToolInvokeMessage
+
+# 下载分块大小，以及内存中缓存的上限（超出后自动落盘）
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+# 分块发送文件时每块的大小，与 SDK 拆分 blob 消息时一致
+BLOB_CHUNK_SIZE = 8192
+
+
+def open_tool_file(file: Any) -> BinaryIO:
+    """以可随机访问的二进制流打开工具的文件参数，避免把整个文件读成一个 bytes 对象
+
+    支持 Dify 的 File 对象（按块流式下载到临时文件）、bytes 以及本地文件路径。
+    调用方负责关闭返回的文件对象。
+    """
+    if isinstance(file, (bytes, bytearray)):
+        stream = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        stream.write(file)
+        stream.seek(0)
+        return stream
+
+    if isinstance(file, (str, os.PathLike)):
+        return open(file, 'rb')
+
+    # Dify File：内容已加载时直接复用，否则按块下载
+    blob = getattr(file, '_blob', None)
+    if blob is not None:
+        return open_tool_file(blob)
+
+    url = getattr(file, 'url', None)
+    if not url:
+        raise ValueError("无效的文件参数：缺少文件URL")
+
+    stream = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    try:
+        with httpx.stream('GET', url) as response:
+            response.raise_for_status()
+            for chunk in response.iter_bytes(DOWNLOAD_CHUNK_SIZE):
+                stream.write(chunk)
+    except httpx.UnsupportedProtocol as e:
+        stream.close()
+        # 错误信息会写入日志并返回给调用方，去掉带签名的查询参数
+        raise ValueError(
+            f"无效的文件URL '{url.split('?', 1)[0]}': {e}。请确认 .env 中已配置 FILES_URL"
+        ) from None
+    except httpx.HTTPStatusError as e:
+        stream.close()
+        # httpx 的原始信息包含完整下载地址，只保留状态码
+        raise ValueError(
+            f"下载文件失败 (HTTP {e.response.status_code}): {url.split('?', 1)[0]}"
+        ) from None
+    except Exception:
+        stream.close()
+        raise
+
+    stream.seek(0)
+    return stream
+
+
+def blob_chunk_messages(stream: BinaryIO, meta: dict, chunk_size: int = BLOB_CHUNK_SIZE) -> Iterator[ToolInvokeMessage]:
+    """把已写完的流按块读出，逐条生成 BLOB_CHUNK 消息，不在内存中拼出完整文件
+
+    消息格式与 SDK 拆分 blob 消息时相同：同一 id、递增序号，每块都携带完整的文件长度，最后以空的结束块收尾。
+    SDK 只拆分 blob 消息，分块消息会原样转发给守护进程。
+    """
+    stream.seek(0, os.SEEK_END)
+    total_length = stream.tell()
+    stream.seek(0)
+    blob_id = str(uuid.uuid4())
+    sequence = 0
+    while True:
+        chunk = stream.read(chunk_size)
+        end = not chunk
+        yield ToolInvokeMessage(
+            type=ToolInvokeMessage.MessageType.BLOB_CHUNK,
+            message=ToolInvokeMessage.BlobChunkMessage(id=blob_id, sequence=sequence, total_length=total_length, blob=chunk, end=end),
+            meta=meta,
+        )
+        if end:
+            return
+        sequence += 1
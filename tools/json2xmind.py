@@ -1,225 +1,59 @@
 from collections.abc import Generator
 from typing import Any
+import csv
+import hashlib
+import io
 import json
 import os
-import tempfile
 import logging
-import mimetypes
 import re
+import tempfile
+import zipfile
 
 from dify_plugin import Tool
 from dify_plugin.entities.tool import ToolInvokeMessage
 from dify_plugin.config.logger_format import plugin_logger_handler
 
-import xmind
-from xmind.core.topic import TopicElement
+from tools import converter
+from tools.converter import XmindConverter, archive_summary, uncompressed_size, zip_entry
+from tools.file_stream import blob_chunk_messages, open_tool_file
+from tools.preview import PREVIEW_DEFAULT_DEPTH, build_preview_tree, render_preview
 
 # 设置插件专用日志
 plugin_logger = logging.getLogger(__name__)
 plugin_logger.setLevel(logging.INFO)
 plugin_logger.addHandler(plugin_logger_handler)
 
+# 大纲（Markdown/缩进列表）输入的行级正则
+OUTLINE_HEADING_RE = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+OUTLINE_BULLET_RE = re.compile(r'^([ \t]*)(?:[-*+]|\d+[.)])\s+(.*)$')
+OUTLINE_NOTE_RE = re.compile(r'^\s*>\s?(.*)$')
+OUTLINE_CHECKBOX_RE = re.compile(r'^\[([ xX])\]\s+')
+OUTLINE_PRIORITY_RE = re.compile(r'\[[Pp]([1-6])\]')
+OUTLINE_META_RE = re.compile(r'\{([^{}]+)\}')
+OUTLINE_META_PAIR_RE = re.compile(r'^\s*([A-Za-z_]+)\s*:\s*(.+?)\s*$')
+# YAML 的 `key: value` / `key:` 行，用于区分以 `#` 注释开头的YAML与Markdown标题
+YAML_KEY_RE = re.compile(r'^\s*[^\s:#][^:]*:(?:\s|$)')
+
+# 文件参数扩展名 → 解析格式
+FILE_FORMATS = {
+    'json': 'json',
+    'csv': 'csv',
+    'tsv': 'tsv', 'tab': 'tsv',
+    'md': 'markdown', 'markdown': 'markdown',
+    'yaml': 'yaml', 'yml': 'yaml',
+}
+
+# .xmind 文件的MIME类型
+XMIND_MIME_TYPE = "application/vnd.xmind.workbook"
+
 # 插件加载时的日志
 plugin_logger.info("🔧 Json2xmindTool 类正在加载")
 
 class Json2xmindTool(Tool):
-    def _apply_metadata(self, topic: TopicElement, data: dict):
-        """应用元数据到XMind主题，支持完整的元数据标记系统"""
-        
-        # 优先级 (1-6) - 增强兼容性
-        if '_priority' in data:
-            priority = data['_priority']
-            # 支持字符串和整数输入
-            try:
-                priority_int = int(priority)
-                if 1 <= priority_int <= 6:
-                    topic.addMarker(f'priority-{priority_int}')
-            except (ValueError, TypeError):
-                pass
-        
-        # 描述标签 - 增强格式处理
-        if '_label' in data:
-            current_title = topic.getTitle() or ""
-            label = str(data['_label']).strip()
-            if label:
-                # 避免重复添加标签
-                if f"({label})" not in current_title:
-                    topic.setTitle(f"{current_title} ({label})")
-        
-        # 备注 - 支持多行和富文本
-        if '_note' in data:
-            note_content = str(data['_note']).strip()
-            if note_content:
-                topic.setPlainNotes(note_content)
-        
-        # 星标 - 增加兼容性和默认值
-        if '_star' in data:
-            star_color = str(data['_star']).lower().strip()
-            valid_star_colors = ['red', 'orange', 'yellow', 'blue', 'green', 'purple', 'default']
-            if star_color in valid_star_colors:
-                topic.addMarker(f'star-{star_color}')
-            elif star_color == 'true' or star_color == '1':  # 兼容布尔值
-                topic.addMarker('star-yellow')  # 默认黄色星标
-        
-        # 旗帜 - 增加兼容性
-        if '_flag' in data:
-            flag_color = str(data['_flag']).lower().strip()
-            valid_flag_colors = ['red', 'orange', 'yellow', 'blue', 'green', 'purple', 'default']
-            if flag_color in valid_flag_colors:
-                topic.addMarker(f'flag-{flag_color}')
-            elif flag_color == 'true' or flag_color == '1':  # 兼容布尔值
-                topic.addMarker('flag-red')  # 默认红色旗帜
-        
-        # 任务进度 - 增加别名支持
-        if '_task' in data:
-            task_progress = str(data['_task']).lower().strip()
-            # 支持多种表达方式
-            task_mapping = {
-                'start': 'start', 'begin': 'start', '0%': 'start', '开始': 'start',
-                'oct': 'oct', '12.5%': 'oct', '1/8': 'oct',
-                'quarter': 'quarter', '25%': 'quarter', '1/4': 'quarter', '四分之一': 'quarter',
-                '3oct': '3oct', '37.5%': '3oct', '3/8': '3oct',
-                'half': 'half', '50%': 'half', '1/2': 'half', '一半': 'half',
-                '5oct': '5oct', '62.5%': '5oct', '5/8': '5oct',
-                '3quar': '3quar', '75%': '3quar', '3/4': '3quar', '四分之三': '3quar',
-                '7oct': '7oct', '87.5%': '7oct', '7/8': '7oct',
-                'done': 'done', 'complete': 'done', '100%': 'done', '完成': 'done'
-            }
-            if task_progress in task_mapping:
-                topic.addMarker(f'task-{task_mapping[task_progress]}')
-        
-        # 表情 - 增加别名支持
-        if '_emotion' in data:
-            emotion = str(data['_emotion']).lower().strip()
-            emotion_mapping = {
-                'smile': 'smile', 'happy': 'smile', '😊': 'smile', '微笑': 'smile',
-                'laugh': 'laugh', 'joy': 'laugh', '😂': 'laugh', '大笑': 'laugh',
-                'angry': 'angry', 'mad': 'angry', '😠': 'angry', '生气': 'angry',
-                'cry': 'cry', 'sad': 'cry', '😢': 'cry', '哭泣': 'cry',
-                'surprise': 'surprise', 'shocked': 'surprise', '😲': 'surprise', '惊讶': 'surprise',
-                'boring': 'boring', 'tired': 'boring', '😴': 'boring', '无聊': 'boring'
-            }
-            if emotion in emotion_mapping:
-                topic.addMarker(f'smiley-{emotion_mapping[emotion]}')
-        
-        # 符号 - 增加别名支持
-        if '_symbol' in data:
-            symbol = str(data['_symbol']).lower().strip()
-            symbol_mapping = {
-                'plus': 'plus', 'add': 'plus', '+': 'plus', '加号': 'plus',
-                'minus': 'minus', 'subtract': 'minus', '-': 'minus', '减号': 'minus',
-                'question': 'question', '?': 'question', '问号': 'question',
-                'exclam': 'exclam', 'exclamation': 'exclam', '!': 'exclam', '感叹号': 'exclam',
-                'info': 'info', 'information': 'info', 'i': 'info', '信息': 'info',
-                'wrong': 'wrong', 'error': 'wrong', 'x': 'wrong', '错误': 'wrong',
-                'right': 'right', 'correct': 'right', 'check': 'right', '正确': 'right'
-            }
-            if symbol in symbol_mapping:
-                topic.addMarker(f'symbol-{symbol_mapping[symbol]}')
-        
-        # 箭头 - 增加更多方向支持
-        if '_arrow' in data:
-            arrow = str(data['_arrow']).lower().strip()
-            arrow_mapping = {
-                'up': 'up', 'north': 'up', '↑': 'up', '上': 'up',
-                'up-right': 'up-right', 'northeast': 'up-right', '↗': 'up-right', '右上': 'up-right',
-                'right': 'right', 'east': 'right', '→': 'right', '右': 'right',
-                'down-right': 'down-right', 'southeast': 'down-right', '↘': 'down-right', '右下': 'down-right',
-                'down': 'down', 'south': 'down', '↓': 'down', '下': 'down',
-                'down-left': 'down-left', 'southwest': 'down-left', '↙': 'down-left', '左下': 'down-left',
-                'left': 'left', 'west': 'left', '←': 'left', '左': 'left',
-                'up-left': 'up-left', 'northwest': 'up-left', '↖': 'up-left', '左上': 'up-left',
-                'refresh': 'refresh', 'reload': 'refresh', '🔄': 'refresh', '刷新': 'refresh'
-            }
-            if arrow in arrow_mapping:
-                topic.addMarker(f'arrow-{arrow_mapping[arrow]}')
-        
-        # 超链接 - 增强URL验证和处理
-        if '_url' in data:
-            url = str(data['_url']).strip()
-            if url:
-                # 简单URL格式验证和修正
-                if not url.startswith(('http://', 'https://', 'ftp://', 'file://')):
-                    if '.' in url:  # 看起来像域名
-                        url = 'https://' + url
-                topic.setURLHyperlink(url)
-        elif '_file' in data:
-            file_path = str(data['_file']).strip()
-            if file_path:
-                topic.setFileHyperlink(file_path)
-        elif '_topic' in data:
-            topic_link = str(data['_topic']).strip()
-            if topic_link:
-                topic.setTopicHyperlink(topic_link)
-        
-        # 折叠状态 - 支持多种表达方式
-        if '_folded' in data:
-            folded_value = data['_folded']
-            # 支持布尔值、字符串、数字
-            if isinstance(folded_value, bool):
-                is_folded = folded_value
-            elif isinstance(folded_value, str):
-                is_folded = folded_value.lower() in ['true', '1', 'yes', 'on', '是', '折叠']
-            elif isinstance(folded_value, (int, float)):
-                is_folded = bool(folded_value)
-            else:
-                is_folded = False
-            
-            if is_folded:
-                topic.setFolded()
-        
-        # 位置设置 - 增强格式兼容性
-        if '_position' in data:
-            position = data['_position']
-            x, y = None, None
-            
-            try:
-                if isinstance(position, (list, tuple)) and len(position) >= 2:
-                    x, y = float(position[0]), float(position[1])
-                elif isinstance(position, str):
-                    # 支持 "x,y" 格式
-                    if ',' in position:
-                        coords = position.split(',')
-                        if len(coords) >= 2:
-                            x, y = float(coords[0].strip()), float(coords[1].strip())
-                elif isinstance(position, dict):
-                    # 支持 {"x": 100, "y": 200} 格式
-                    if 'x' in position and 'y' in position:
-                        x, y = float(position['x']), float(position['y'])
-                
-                if x is not None and y is not None:
-                    topic.setPosition(int(x), int(y))
-            except (ValueError, TypeError, IndexError):
-                pass  # 忽略无效的位置数据
-        
-        # 新增：样式支持
-        if '_style' in data:
-            style = str(data['_style']).lower().strip()
-            # 虽然XMind库可能不直接支持，但为未来扩展预留
-            if style in ['bold', 'italic', 'underline']:
-                # 可以通过修改标题来实现简单样式
-                current_title = topic.getTitle() or ""
-                if style == 'bold' and not current_title.startswith('**'):
-                    topic.setTitle(f"**{current_title}**")
-                elif style == 'italic' and not current_title.startswith('*'):
-                    topic.setTitle(f"*{current_title}*")
-        
-        # 新增：颜色支持（通过样式实现）
-        if '_color' in data:
-            color = str(data['_color']).lower().strip()
-            # 由于XMind库的限制，暂时保留颜色信息作为备注
-            valid_colors = ['red', 'orange', 'yellow', 'green', 'blue', 'purple', 'pink', 'gray', 'black']
-            if color in valid_colors:
-                # 由于XMind库的限制，暂时保留颜色信息作为备注
-                try:
-                    notes_element = topic.getNotes()
-                    current_text = notes_element.getContent() if notes_element else ""
-                except:
-                    current_text = ""
-                color_note = f"[颜色: {color}]" if not current_text else f"\n[颜色: {color}]"
-                topic.setPlainNotes(current_text + color_note)
+    # 转换逻辑在 tools/converter.py 的 XmindConverter 中，本类只负责参数解析、输入解析和消息输出
     
-    def _parse_input_data(self, input_data: Any) -> Any:
+    def _parse_input_data(self, input_data: Any, input_format: str = 'auto', group_by: list[str] | None = None) -> Any:
         """智能解析各种格式的输入数据，大幅提升兼容性"""
         
         # 如果已经是字典或列表，直接返回
@@ -241,6 +75,14 @@ class Json2xmindTool(Tool):
         if not data_str or data_str.lower() in ['null', 'none', 'undefined', 'nil', '空']:
             return None
         
+        # 明确指定的表格格式：直接走流式CSV/TSV解析
+        if input_format in ('csv', 'tsv'):
+            return self._parse_csv_to_dict(data_str, delimiter='\t' if input_format == 'tsv' else ',', group_by=group_by)
+        
+        # 明确指定的大纲格式：Markdown标题/列表
+        if input_format == 'markdown':
+            return self._parse_outline(data_str)
+        
         # 尝试JSON解析
         try:
             return json.loads(data_str)
@@ -259,6 +101,13 @@ class Json2xmindTool(Tool):
         except json.JSONDecodeError:
             pass
         
+        # 尝试解析为Markdown/缩进大纲格式
+        try:
+            if self._looks_like_outline(data_str):
+                return self._parse_outline(data_str)
+        except:
+            pass
+        
         # 尝试解析为YAML格式（简单支持）
         try:
             # 检测YAML格式特征
@@ -267,10 +116,10 @@ class Json2xmindTool(Tool):
         except:
             pass
         
-        # 尝试解析为CSV格式
+        # 尝试解析为CSV/TSV格式
         try:
-            if ',' in data_str and '\n' in data_str:
-                return self._parse_csv_to_dict(data_str)
+            if '\n' in data_str and ('\t' in data_str or ',' in data_str):
+                return self._parse_csv_to_dict(data_str, group_by=group_by)
         except:
             pass
         
@@ -293,8 +142,11 @@ class Json2xmindTool(Tool):
     
     def _parse_simple_yaml(self, yaml_str: str) -> dict:
         """简单的YAML解析器，支持基本的键值对结构"""
+        return self._parse_simple_yaml_lines(io.StringIO(yaml_str.strip()))
+    
+    def _parse_simple_yaml_lines(self, lines: Any) -> dict:
+        """逐行解析简单YAML，lines 可以是任意按行迭代的对象"""
         result = {}
-        lines = yaml_str.strip().split('\n')
         current_dict = result
         indent_stack = [result]
         
@@ -332,25 +184,248 @@ class Json2xmindTool(Tool):
         
         return result
     
-    def _parse_csv_to_dict(self, csv_str: str) -> dict:
-        """将CSV格式转换为字典结构"""
-        lines = csv_str.strip().split('\n')
-        if len(lines) < 2:
-            return {"数据": csv_str}
+    def _parse_input_file(self, input_file: Any, input_format: str = 'auto', group_by: list[str] | None = None) -> Any:
+        """按块读取文件参数并直接交给对应的解析器
+        
+        CSV/TSV、Markdown 大纲和 YAML 按行流式解析，不会生成完整的中间字符串；
+        JSON 由 json.load 从文本流读取，只在解码时持有一份文本。
+        """
+        file_format = input_format if input_format != 'auto' else self._detect_file_format(input_file)
         
-        headers = [h.strip() for h in lines[0].split(',')]
+        with open_tool_file(input_file) as stream:
+            text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+            try:
+                if file_format in ('csv', 'tsv'):
+                    return self._parse_csv_rows(text, '\t' if file_format == 'tsv' else ',', group_by) or None
+                if file_format == 'markdown':
+                    return self._parse_outline_lines(text) or None
+                if file_format == 'yaml':
+                    return self._parse_simple_yaml_lines(text) or None
+                if file_format == 'json':
+                    try:
+                        return json.load(text)
+                    except json.JSONDecodeError:
+                        # 非严格JSON：回退到字符串的智能解析
+                        text.seek(0)
+                return self._parse_input_data(text.read(), input_format, group_by)
+            finally:
+                text.detach()
+    
+    def _detect_file_format(self, input_file: Any) -> str:
+        """根据文件扩展名判断解析格式，无法判断时返回 auto"""
+        extension = getattr(input_file, 'extension', None) or ""
+        if not extension:
+            filename = getattr(input_file, 'filename', None)
+            if filename is None and isinstance(input_file, (str, os.PathLike)):
+                filename = os.fspath(input_file)
+            extension = os.path.splitext(filename or "")[1]
+        return FILE_FORMATS.get(extension.lower().lstrip('.'), 'auto')
+    
+    def _looks_like_outline(self, text: str) -> bool:
+        """判断文本是否为Markdown标题或列表大纲
+        
+        `# 标题` 同时也是YAML注释：跳过开头的 `#` 行，首个内容行是列表项时按大纲处理，
+        是 `key: value` 时按YAML处理；只有标题没有内容行时仍视为大纲。
+        """
+        heading = False
+        for line in io.StringIO(text):
+            if not line.strip():
+                continue
+            if line.lstrip().startswith('#'):
+                heading = heading or bool(OUTLINE_HEADING_RE.match(line))
+                continue
+            if OUTLINE_BULLET_RE.match(line):
+                return True
+            return heading and not YAML_KEY_RE.match(line)
+        return heading
+    
+    def _parse_outline(self, outline_str: str) -> dict:
+        """将Markdown/缩进大纲转换为字典结构"""
+        result = self._parse_outline_lines(io.StringIO(outline_str))
+        return result if result else {"内容": outline_str.strip()}
+    
+    def _parse_outline_lines(self, lines: Any) -> dict:
+        """单次遍历解析大纲，输出与JSON输入相同的嵌套字典和 _ 元数据
+        
+        支持的语法：
+        - `#`~`######` 标题，按级别嵌套
+        - `-`/`*`/`+`/`1.` 列表项，按缩进嵌套在最近的标题之下
+        - `[P1]`~`[P6]` → _priority，`{star:red, flag:green}` → _star/_flag 等任意元数据
+        - `[x]`/`[ ]` 复选框 → _task done/start
+        - `> 文本` 或普通段落行 → 追加到上一个节点的 _note
+        """
         result = {}
+        # 栈帧: [层级, 节点字典, 同名计数]；标题层级为1-6，列表层级为 100 + 缩进宽度
+        stack = [[0, result, {}]]
+        last_node = None
         
-        for i, line in enumerate(lines[1:], 1):
-            values = [v.strip() for v in line.split(',')]
-            row_data = {}
-            for j, header in enumerate(headers):
-                if j < len(values):
-                    row_data[header] = values[j]
-            result[f"行{i}"] = row_data
+        for raw_line in lines:
+            line = raw_line.rstrip('\r\n')
+            if not line.strip():
+                continue
+            
+            heading = OUTLINE_HEADING_RE.match(line)
+            bullet = None if heading else OUTLINE_BULLET_RE.match(line)
+            if heading:
+                level = len(heading.group(1))
+                text = heading.group(2)
+            elif bullet:
+                level = 100 + len(bullet.group(1).expandtabs(4))
+                text = bullet.group(2)
+            else:
+                # 备注或普通段落：归属上一个节点
+                note_match = OUTLINE_NOTE_RE.match(line)
+                note_text = (note_match.group(1) if note_match else line).strip()
+                if last_node is not None and note_text:
+                    current_note = last_node.get('_note')
+                    last_node['_note'] = f"{current_note}\n{note_text}" if current_note else note_text
+                continue
+            
+            title, metadata = self._parse_outline_title(text)
+            while stack[-1][0] >= level:
+                stack.pop()
+            parent = stack[-1]
+            
+            # 同级同名节点追加序号，避免字典键被覆盖
+            count = parent[2].get(title, 0) + 1
+            parent[2][title] = count
+            key = title if count == 1 else f"{title} ({count})"
+            
+            node = dict(metadata)
+            parent[1][key] = node
+            stack.append([level, node, {}])
+            last_node = node
         
         return result
     
+    def _parse_outline_title(self, text: str) -> tuple[str, dict]:
+        """从大纲行文本中剥离行内元数据，返回 (标题, 元数据字典)"""
+        metadata = {}
+        
+        checkbox = OUTLINE_CHECKBOX_RE.match(text)
+        if checkbox:
+            metadata['_task'] = 'start' if checkbox.group(1) == ' ' else 'done'
+            text = text[checkbox.end():]
+        
+        def take_priority(match):
+            metadata['_priority'] = int(match.group(1))
+            return ''
+        text = OUTLINE_PRIORITY_RE.sub(take_priority, text)
+        
+        def take_metadata(match):
+            pairs = [OUTLINE_META_PAIR_RE.match(part) for part in match.group(1).split(',')]
+            # 只有全部为 key:value 形式时才视为元数据，否则保留原文
+            if not all(pairs):
+                return match.group(0)
+            for pair in pairs:
+                key = pair.group(1).lower()
+                metadata[key if key.startswith('_') else f'_{key}'] = pair.group(2)
+            return ''
+        text = OUTLINE_META_RE.sub(take_metadata, text)
+        
+        title = re.sub(r'\s+', ' ', text).strip()
+        return title, metadata
+    
+    def _parse_csv_to_dict(self, csv_str: str, delimiter: str | None = None, group_by: list[str] | None = None) -> dict:
+        """将CSV/TSV格式转换为字典结构"""
+        if delimiter is None:
+            # 根据首行自动判断分隔符，制表符优先
+            first_line = csv_str.split('\n', 1)[0]
+            delimiter = '\t' if '\t' in first_line else ','
+        
+        result = self._parse_csv_rows(io.StringIO(csv_str.strip()), delimiter, group_by)
+        return result if result else {"数据": csv_str}
+    
+    def _parse_csv_rows(self, lines: Any, delimiter: str = ',', group_by: list[str] | None = None) -> dict:
+        """基于csv模块逐行读取表格数据，可按 group_by 列逐级透视为层级结构
+        
+        lines 可以是任意按行迭代的对象（StringIO、文件句柄等），整个过程只遍历一次，
+        不会预先切分出全部行。每个分组列都是一级分组，同值的行归入同一分组节点；
+        行挂在最内层分组之下，以第一个非分组列的值为标题，其余列作为子节点。
+        """
+        reader = csv.reader(lines, delimiter=delimiter)
+        headers = None
+        for row in reader:
+            if any(cell.strip() for cell in row):
+                headers = [h.strip() for h in row]
+                break
+        if not headers:
+            return {}
+        
+        # 只保留表头中真实存在的分组列，并记录其列索引
+        group_columns = [col.strip() for col in (group_by or []) if col and col.strip() in headers]
+        group_indexes = [headers.index(col) for col in group_columns]
+        value_columns = [(j, header) for j, header in enumerate(headers) if j not in group_indexes]
+        
+        result = {}
+        if not group_indexes:
+            row_number = 0
+            for row in reader:
+                if not any(cell.strip() for cell in row):
+                    continue
+                row_number += 1
+                values = [v.strip() for v in row]
+                result[f"行{row_number}"] = {header: values[j] for j, header in value_columns if j < len(values)}
+            return result
+        
+        # 分组取值路径 → [分组节点, 行标题计数]；同名行追加序号，与大纲解析的同名处理一致
+        groups = {}
+        title_index = value_columns[0][0] if value_columns else None
+        data_columns = value_columns[1:]
+        for row in reader:
+            if not any(cell.strip() for cell in row):
+                continue
+            values = [v.strip() for v in row]
+            path = tuple(
+                values[j] if j < len(values) and values[j] else f"(空{group_columns[depth]})"
+                for depth, j in enumerate(group_indexes)
+            )
+            group = groups.get(path)
+            if group is None:
+                # 逐级下钻到分组节点，只在首次遇到该分组时进行
+                node = result
+                for key in path:
+                    child = node.get(key)
+                    if not isinstance(child, dict):
+                        child = node[key] = {}
+                    node = child
+                group = groups[path] = [node, {}]
+            node, counts = group
+            
+            title = values[title_index] if title_index is not None and title_index < len(values) else ""
+            if not title:
+                title = f"行{len(node) + 1}"
+            count = counts.get(title, 0) + 1
+            counts[title] = count
+            key = title if count == 1 else f"{title} ({count})"
+            node[key] = {header: values[j] for j, header in data_columns if j < len(values)}
+        
+        return result
+    
+    def _parse_group_by(self, group_by: Any) -> list[str]:
+        """解析分组列参数，支持列表或以逗号、> 、→ 分隔的字符串"""
+        if not group_by:
+            return []
+        if isinstance(group_by, (list, tuple)):
+            columns = [str(col) for col in group_by]
+        else:
+            columns = re.split(r'[,，>→]', str(group_by))
+        return [col.strip() for col in columns if col and col.strip()]
+    
+    def _parse_bool(self, value: Any) -> bool:
+        """解析布尔参数，兼容字符串和数字"""
+        if isinstance(value, str):
+            return value.lower().strip() in ['true', '1', 'yes', 'on', '是']
+        return bool(value)
+    
+    def _parse_int(self, value: Any, default: int) -> int:
+        """解析整数参数，缺省或无法解析（如 "abc"）时回退到默认值"""
+        try:
+            return int(value) if value not in (None, '') else default
+        except (TypeError, ValueError):
+            plugin_logger.warning(f"⚠️ 无法解析整数参数 {value!r}，使用默认值 {default}")
+            return default
+    
     def _parse_key_value_pairs(self, kv_str: str) -> dict:
         """解析键值对格式的字符串"""
         result = {}
@@ -426,205 +501,76 @@ class Json2xmindTool(Tool):
         
         return result
     
-    def _convert_json_to_xmind(self, data: Any, parent_topic: TopicElement, max_depth: int = 10, current_depth: int = 0):
-        """递归转换JSON为XMind主题结构，增强错误处理和格式兼容性"""
-        
-        # 安全检查
-        if current_depth >= max_depth:
-            plugin_logger.warning(f"达到最大递归深度 {max_depth}，停止处理")
-            return
-            
-        if data is None:
-            return
-        
-        try:
-            if isinstance(data, dict):
-                # 分离元数据和内容数据
-                metadata = {k: v for k, v in data.items() if k.startswith('_')}
-                content = {k: v for k, v in data.items() if not k.startswith('_')}
-                
-                # 如果有元数据，安全地应用到当前主题
-                if metadata:
-                    try:
-                        self._apply_metadata(parent_topic, metadata)
-                    except Exception as e:
-                        plugin_logger.warning(f"应用元数据失败: {e}")
-                
-                # 处理内容数据
-                for key, value in content.items():
-                    try:
-                        # 清理和验证键名
-                        clean_key = self._clean_node_title(str(key))
-                        if not clean_key:
-                            clean_key = f"节点{len(parent_topic.getSubTopics()) + 1}"
-                        
-                        child_topic = parent_topic.addSubTopic()
-                        child_topic.setTitle(clean_key)
-                        
-                        if value is None:
-                            # null值：只创建节点，添加特殊标记
-                            child_topic.setPlainNotes("空值")
-                            continue
-                        elif isinstance(value, (dict, list)):
-                            # 复杂类型：继续递归
-                            self._convert_json_to_xmind(value, child_topic, max_depth, current_depth + 1)
-                        else:
-                            # 基础类型：创建子节点或直接设置内容
-                            self._handle_leaf_value(child_topic, value)
-                    except Exception as e:
-                        plugin_logger.error(f"处理键 '{key}' 时出错: {e}")
-                        # 创建错误节点以保持数据完整性
-                        error_topic = parent_topic.addSubTopic()
-                        error_topic.setTitle(f"错误: {key}")
-                        error_topic.setPlainNotes(f"处理失败: {str(e)}")
-            
-            elif isinstance(data, list):
-                # 数组：为每个元素创建同级子主题
-                for i, item in enumerate(data):
-                    try:
-                        child_topic = parent_topic.addSubTopic()
-                        
-                        # 智能命名数组项
-                        if isinstance(item, dict) and item:
-                            # 尝试从字典中提取有意义的标题
-                            title = self._extract_meaningful_title(item, i)
-                        elif isinstance(item, str) and len(item) <= 50:
-                            # 短字符串直接作为标题
-                            title = self._clean_node_title(item)
-                        else:
-                            # 默认编号
-                            title = f"项目 {i+1}"
-                        
-                        child_topic.setTitle(title)
-                        
-                        if isinstance(item, (dict, list)):
-                            self._convert_json_to_xmind(item, child_topic, max_depth, current_depth + 1)
-                        else:
-                            self._handle_leaf_value(child_topic, item)
-                    except Exception as e:
-                        plugin_logger.error(f"处理数组项 {i} 时出错: {e}")
-                        # 创建错误节点
-                        error_topic = parent_topic.addSubTopic()
-                        error_topic.setTitle(f"错误项目 {i+1}")
-                        error_topic.setPlainNotes(f"处理失败: {str(e)}")
-            
-            else:
-                # 基础类型：直接处理
-                self._handle_leaf_value(parent_topic, data)
-                
-        except Exception as e:
-            plugin_logger.error(f"转换过程中发生严重错误: {e}")
-            # 添加错误信息到思维导图中
-            error_topic = parent_topic.addSubTopic()
-            error_topic.setTitle("转换错误")
-            error_topic.setPlainNotes(f"数据转换失败: {str(e)}")
-    
-    def _clean_node_title(self, title: str) -> str:
-        """清理节点标题，确保XMind兼容性"""
-        if not title:
-            return ""
-        
-        # 移除控制字符和特殊字符
-        cleaned = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', str(title))
-        
-        # 限制长度，避免显示问题
-        if len(cleaned) > 100:
-            cleaned = cleaned[:97] + "..."
-        
-        # 移除首尾空白
-        return cleaned.strip()
-    
-    def _extract_meaningful_title(self, item: dict, index: int) -> str:
-        """从字典中提取有意义的标题"""
-        # 常见的标题字段
-        title_fields = ['title', 'name', 'label', '标题', '名称', '名字', 'id', 'key']
-        
-        for field in title_fields:
-            if field in item:
-                title = self._clean_node_title(str(item[field]))
-                if title:
-                    return title
-        
-        # 如果没有找到标题字段，使用第一个字符串值
-        for key, value in item.items():
-            if isinstance(value, str) and len(value) <= 50:
-                title = self._clean_node_title(value)
-                if title:
-                    return f"{title}"
-        
-        # 默认编号
-        return f"项目 {index+1}"
-    
-    def _handle_leaf_value(self, topic: TopicElement, value: Any):
-        """处理叶子节点的值，增强类型支持"""
-        try:
-            if value is None:
-                topic.setPlainNotes("空值")
-                return
-            
-            # 转换为字符串
-            str_value = str(value)
-            
-            # 对于简短的值，直接作为子节点
-            if len(str_value) <= 100:
-                leaf_topic = topic.addSubTopic()
-                leaf_topic.setTitle(self._clean_node_title(str_value))
-            else:
-                # 对于长文本，放在备注中
-                topic.setPlainNotes(str_value[:500] + ("..." if len(str_value) > 500 else ""))
-                
-            # 根据值类型添加额外信息
-            if isinstance(value, bool):
-                topic.addMarker('symbol-right' if value else 'symbol-wrong')
-            elif isinstance(value, (int, float)):
-                if isinstance(value, int) and value > 0:
-                    # 为正数添加正面标记
-                    topic.addMarker('symbol-plus')
-                elif isinstance(value, (int, float)) and value < 0:
-                    # 为负数添加负面标记
-                    topic.addMarker('symbol-minus')
-            elif isinstance(value, str):
-                # 检测URL
-                if value.startswith(('http://', 'https://', 'ftp://')):
-                    topic.setURLHyperlink(value)
-                    topic.addMarker('symbol-info')
-                # 检测邮箱
-                elif '@' in value and '.' in value:
-                    topic.addMarker('symbol-info')
-                    
-        except Exception as e:
-            plugin_logger.error(f"处理叶子值时出错: {e}")
-            # 安全处理：至少创建一个节点
-            try:
-                leaf_topic = topic.addSubTopic()
-                leaf_topic.setTitle("数据处理错误")
-                leaf_topic.setPlainNotes(f"原值: {str(value)[:100]}, 错误: {str(e)}")
-            except:
-                pass  # 如果连错误节点都创建不了，就忽略
+    def _describe_parameter(self, value: Any) -> Any:
+        """参数的日志摘要：文本与容器记录长度，基础类型记录取值，文件等其他对象只记录文件名"""
+        if isinstance(value, (str, list, dict)):
+            return len(value)
+        if value is None or isinstance(value, (bool, int, float)):
+            return value
+        return getattr(value, 'filename', None)
     
     def _invoke(self, tool_parameters: dict[str, Any]) -> Generator[ToolInvokeMessage]:
         plugin_logger.info("🚀 JSON2XMind工具开始执行")
-        plugin_logger.info(f"📋 接收到的参数: {tool_parameters}")
-        plugin_logger.info(f"🔧 参数类型: {[(k, type(v).__name__) for k, v in tool_parameters.items()]}")
+        # 只记录参数摘要，避免把大体积的 json_data 或文件对象（含签名下载地址）格式化进日志
+        plugin_logger.info(f"📋 接收到的参数: {[(k, type(v).__name__, self._describe_parameter(v)) for k, v in tool_parameters.items()]}")
         
         try:
             # 获取参数
-            json_data = tool_parameters.get('json_data', '{}')
+            json_data = tool_parameters.get('json_data')
+            json_file = tool_parameters.get('json_file')
             root_title = tool_parameters.get('root_title', '思维导图')
             max_depth = tool_parameters.get('max_depth', 10)
+            input_format = str(tool_parameters.get('input_format') or 'auto').lower().strip()
+            group_by = self._parse_group_by(tool_parameters.get('group_by'))
+            
+            batch_mode = str(tool_parameters.get('batch_mode') or 'off').lower().strip()
+            deterministic = self._parse_bool(tool_parameters.get('deterministic', False))
+            compact = str(tool_parameters.get('output_profile') or 'standard').lower().strip() == 'compact'
+            fold_leaves = self._parse_bool(tool_parameters.get('fold_leaves', False))
+            # 实验性：分块写出并发送 .xmind
+            stream_output = self._parse_bool(tool_parameters.get('experimental_stream_output', False))
+            # 预览模式：只返回文本大纲，不生成 .xmind
+            preview = str(tool_parameters.get('output_mode') or 'file').lower().strip() == 'preview'
+            preview_format = str(tool_parameters.get('preview_format') or 'markdown').lower().strip()
+            preview_depth = self._parse_int(tool_parameters.get('preview_depth'), PREVIEW_DEFAULT_DEPTH)
+            
+            plugin_logger.info(f"✅ 参数解析完成: json_data类型={type(json_data)}, json_file={getattr(json_file, 'filename', None)}, root_title={root_title}, max_depth={max_depth}, input_format={input_format}, group_by={group_by}, batch_mode={batch_mode}")
+            
+            if not json_file and (json_data is None or (isinstance(json_data, str) and not json_data.strip())):
+                yield self.create_json_message({
+                    "success": False,
+                    "error": "未提供输入数据",
+                    "message": "请通过 json_data 传入数据，或通过 json_file 上传数据文件。"
+                })
+                return
             
-            plugin_logger.info(f"✅ 参数解析完成: json_data类型={type(json_data)}, root_title={root_title}, max_depth={max_depth}")
+            # 批量模式：一次调用转换多个导图
+            if batch_mode in ('workbook', 'zip'):
+                if json_file:
+                    with open_tool_file(json_file) as stream:
+                        json_data = stream.read().decode('utf-8-sig')
+                defaults = {"max_depth": max_depth, "input_format": input_format, "group_by": group_by, "deterministic": deterministic, "compact": compact, "fold_leaves": fold_leaves}
+                workers = tool_parameters.get('batch_workers') or 1
+                yield from self._invoke_batch(json_data, root_title, batch_mode, defaults, workers)
+                return
             
-            # 调试信息
-            yield self.create_text_message(f"🔧 开始处理JSON转XMind转换...")
-            yield self.create_text_message(f"📝 参数信息: 根标题={root_title}, 最大深度={max_depth}")
-            yield self.create_text_message(f"📊 输入数据类型: {type(json_data).__name__}")
+            # 调试信息（预览模式只输出一条预览文本，不发送过程消息）
+            if not preview:
+                yield self.create_text_message(f"🔧 开始处理JSON转XMind转换...")
+                yield self.create_text_message(f"📝 参数信息: 根标题={root_title}, 最大深度={max_depth}")
+                if json_file:
+                    yield self.create_text_message(f"📊 输入文件: {getattr(json_file, 'filename', None) or '未命名文件'}")
+                else:
+                    yield self.create_text_message(f"📊 输入数据类型: {type(json_data).__name__}")
             
             
             # 智能解析JSON数据 - 大幅增强格式兼容性
             plugin_logger.info("🔍 开始解析JSON数据")
             try:
-                data = self._parse_input_data(json_data)
+                if json_file:
+                    data = self._parse_input_file(json_file, input_format, group_by)
+                else:
+                    data = self._parse_input_data(json_data, input_format, group_by)
                 
                 # 验证数据不为空
                 if data is None:
@@ -635,8 +581,9 @@ class Json2xmindTool(Tool):
                     })
                     return
                 
-                yield self.create_text_message(f"✅ 数据解析成功! 数据类型: {type(data).__name__}")
-                plugin_logger.info(f"✅ 数据解析成功: 数据类型={type(data)}, 数据长度={len(str(data))}")
+                if not preview:
+                    yield self.create_text_message(f"✅ 数据解析成功! 数据类型: {type(data).__name__}")
+                plugin_logger.info(f"✅ 数据解析成功: 数据类型={type(data)}, 顶层元素数={len(data) if isinstance(data, (dict, list)) else 1}")
                     
             except Exception as e:
                 plugin_logger.error(f"❌ 数据解析失败: {e}")
@@ -647,113 +594,29 @@ class Json2xmindTool(Tool):
                 })
                 return
             
-            # 创建XMind工作簿
-            yield self.create_text_message(f"🏗️ 正在创建XMind工作簿...")
-            plugin_logger.info("🏗️ 开始创建XMind工作簿")
-            
-            # 直接使用WorkbookDocument创建新的工作簿
-            try:
-                from xmind.core.workbook import WorkbookDocument
-                from xmind.core.styles import StylesBookDocument
-                from xmind.core.comments import CommentsBookDocument
-                
-                workbook = WorkbookDocument()
-                # 初始化必要的子文档
-                workbook.stylesbook = StylesBookDocument()
-                workbook.commentsbook = CommentsBookDocument()
-                # 设置一个临时路径以避免 None 路径问题
-                workbook.set_path("/tmp/temp.xmind")
-                
-                sheet = workbook.getPrimarySheet()
-                if sheet is None:
-                    raise ValueError("无法获取主工作表")
-                sheet.setTitle("JSON转换结果")
-                
-                root_topic = sheet.getRootTopic()
-                if root_topic is None:
-                    raise ValueError("无法获取根主题")
-                root_topic.setTitle(root_title)
-            except ImportError as e:
-                raise Exception(f"XMind库导入失败，请确保已正确安装xmind库: {str(e)}")
-            except Exception as e:
-                raise Exception(f"创建XMind工作簿失败: {str(e)}")
-            yield self.create_text_message(f"📋 工作簿创建完成，根节点: {root_title}")
-            plugin_logger.info(f"✅ XMind工作簿创建完成: 根节点={root_title}")
+            options = {"deterministic": deterministic, "compact": compact, "fold_leaves": fold_leaves}
+            if preview:
+                yield from self._invoke_preview(data, root_title, max_depth, options, preview_format, preview_depth)
+                return
             
-            # 转换JSON数据到XMind
+            # 转换JSON数据到XMind：大任务交给进程池，小任务在当前线程完成
             yield self.create_text_message(f"🔄 开始转换JSON数据到XMind结构...")
             plugin_logger.info("🔄 开始转换JSON到XMind结构")
-            self._convert_json_to_xmind(data, root_topic, max_depth)
+            if stream_output:
+                yield from self._invoke_stream(data, root_title, max_depth, options)
+                return
+            file_content, statistics, pooled = converter.convert(data, root_title, max_depth, options)
             yield self.create_text_message(f"✅ JSON结构转换完成!")
-            plugin_logger.info("✅ JSON到XMind结构转换完成")
-            
-            # 计算统计信息
-            def count_nodes(topic: TopicElement):
-                count = 1
-                sub_topics = topic.getSubTopics()
-                if sub_topics:
-                    for sub_topic in sub_topics:
-                        count += count_nodes(sub_topic)
-                return count
+            plugin_logger.info(f"✅ JSON到XMind结构转换完成 (进程池={pooled})")
             
-            total_nodes = count_nodes(root_topic)
+            total_nodes = statistics["total_nodes"]
             filename = f"{root_title}.xmind"
-            
-            yield self.create_text_message(f"📊 统计信息: 总节点数={total_nodes}, 文件名={filename}")
-            yield self.create_text_message(f"💾 正在生成XMind文件...")
-            
-            # 生成XMind文件
-            plugin_logger.info("📄 开始生成临时XMind文件")
-            temp_file = tempfile.NamedTemporaryFile(suffix='.xmind', delete=False)
-            temp_path = temp_file.name
-            temp_file.close()  # 关闭文件句柄，但保留文件
-            
-            if temp_path is None:
-                raise ValueError("无法创建临时文件")
-            
-            # 保存XMind文件
-            plugin_logger.info(f"💾 保存XMind文件到: {temp_path}")
-            try:
-                xmind.save(workbook, temp_path)
-            except Exception as e:
-                # 清理可能创建的临时文件
-                try:
-                    if os.path.exists(temp_path):
-                        os.unlink(temp_path)
-                except:
-                    pass
-                raise Exception(f"保存XMind文件失败: {str(e)}")
-            
-            # 读取文件内容
-            plugin_logger.info("📖 读取XMind文件内容")
-            try:
-                with open(temp_path, 'rb') as f:
-                    file_content = f.read()
-                plugin_logger.info(f"✅ 文件读取成功，大小: {len(file_content)} bytes")
-            except Exception as e:
-                # 清理临时文件
-                try:
-                    os.unlink(temp_path)
-                except:
-                    pass
-                raise Exception(f"读取文件内容失败: {str(e)}")
-            
             file_size = len(file_content)
             
-            # 清理临时文件
-            try:
-                os.unlink(temp_path)
-            except Exception as e:
-                plugin_logger.warning(f"⚠️ 清理临时文件失败: {e}")
-            
-            # 智能推断MIME类型并返回文件
-            # 确保XMind类型已注册
-            mimetypes.add_type('application/vnd.xmind.workbook', '.xmind')
+            yield self.create_text_message(f"📊 统计信息: 总节点数={total_nodes}, 文件名={filename}")
             
-            mime_type, _ = mimetypes.guess_type(filename)
-            if not mime_type:
-                # 如果无法推断，使用XMind的标准MIME类型
-                mime_type = "application/vnd.xmind.workbook"
+            # 输出文件固定为 .xmind，直接使用标准MIME类型，无需每次调用都注册和查询 mimetypes
+            mime_type = XMIND_MIME_TYPE
             
             plugin_logger.info(f"📁 使用MIME类型: {mime_type} 用于文件: {filename}")
             
@@ -771,12 +634,12 @@ class Json2xmindTool(Tool):
                 "message": f"XMind文件已生成，可直接下载使用",
                 "filename": filename,
                 "file_size": file_size,
+                "content_hash": hashlib.sha256(file_content).hexdigest(),
+                "deterministic": deterministic,
+                "output_profile": "compact" if compact else "standard",
+                "uncompressed_size": uncompressed_size(file_content),
                 "instructions": "📥 点击下载按钮即可获取 XMind 文件，可直接在 XMind 软件中打开使用",
-                "statistics": {
-                    "total_nodes": total_nodes,
-                    "max_depth_used": min(max_depth, self._calculate_depth(data)),
-                    "root_title": root_title
-                }
+                "statistics": statistics
             })
             
         except Exception as e:
@@ -788,24 +651,255 @@ class Json2xmindTool(Tool):
                 "error_type": type(e).__name__
             })
     
-    def _calculate_depth(self, data: Any, current_depth: int = 0) -> int:
-        """计算JSON数据的最大深度"""
-        if not isinstance(data, (dict, list)):
-            return current_depth
-        
-        max_child_depth = current_depth
-        
-        if isinstance(data, dict):
-            for key, value in data.items():
-                if not str(key).startswith('_'):  # 忽略元数据字段
-                    child_depth = self._calculate_depth(value, current_depth + 1)
-                    max_child_depth = max(max_child_depth, child_depth)
-        elif isinstance(data, list):
-            for item in data:
-                child_depth = self._calculate_depth(item, current_depth + 1)
-                max_child_depth = max(max_child_depth, child_depth)
-        
-        return max_child_depth
+    def _invoke_preview(self, data: Any, root_title: str, max_depth: int, options: dict, preview_format: str, preview_depth: int) -> Generator[ToolInvokeMessage]:
+        """预览模式：按相同的标题与元数据规则渲染限深的 Markdown 大纲或 Mermaid mindmap，跳过 DOM、zip 和压缩"""
+        if preview_format not in ('markdown', 'mermaid'):
+            yield self.create_json_message({
+                "success": False,
+                "error": f"不支持的预览格式: {preview_format}",
+                "message": "preview_format 可选 markdown 或 mermaid"
+            })
+            return
+        
+        root, omitted = build_preview_tree(data, root_title, max_depth, preview_depth, options)
+        text, statistics = render_preview(root, preview_format, preview_depth, omitted)
+        plugin_logger.info(f"👀 预览生成完成: 格式={preview_format}, 显示节点数={statistics['nodes_shown']}")
+        
+        yield self.create_text_message(text)
+        yield self.create_json_message({
+            "success": True,
+            "message": "已生成结构预览；将 output_mode 设为 file 即可生成 XMind 文件",
+            "output_mode": "preview",
+            "preview_format": preview_format,
+            "preview_depth": preview_depth,
+            "statistics": {"root_title": root_title, **statistics}
+        })
+    
+    def _invoke_stream(self, data: Any, root_title: str, max_depth: int, options: dict) -> Generator[ToolInvokeMessage]:
+        """实验性的分块输出：把 .xmind 写入临时文件，再以 BLOB_CHUNK 消息逐块发送
+        
+        与整体输出一样，大任务交给转换进程池，由工作进程把文件写入临时文件，文件内容不经过进程间管道，
+        也不在插件进程中完整驻留；文件与整体输出逐字节一致。每个分块都带有完整的文件长度，与 SDK 拆分 blob 消息的格式一致。
+        """
+        fd, path = tempfile.mkstemp(prefix='json2xmind-', suffix='.xmind')
+        os.close(fd)
+        try:
+            statistics, pooled = converter.convert_to_file(data, root_title, max_depth, options, path)
+            summary = archive_summary(path)
+            yield self.create_text_message("✅ JSON结构转换完成!")
+            plugin_logger.info(f"✅ JSON到XMind结构转换完成 (分块输出, 进程池={pooled})")
+            
+            filename = f"{root_title}.xmind"
+            yield self.create_text_message(f"📊 统计信息: 总节点数={statistics['total_nodes']}, 文件名={filename}")
+            
+            sequence = 0
+            with open(path, 'rb') as output:
+                for message in blob_chunk_messages(output, {"mime_type": XMIND_MIME_TYPE, "filename": filename}):
+                    sequence = message.message.sequence
+                    yield message
+        finally:
+            os.unlink(path)
+        
+        yield self.create_json_message({
+            "success": True,
+            "message": "XMind文件已生成，可直接下载使用",
+            "filename": filename,
+            "file_size": summary["file_size"],
+            "content_hash": summary["content_hash"],
+            "deterministic": options["deterministic"],
+            "output_profile": "compact" if options["compact"] else "standard",
+            "uncompressed_size": summary["uncompressed_size"],
+            "streamed": True,
+            "chunks": sequence,
+            "instructions": "📥 点击下载按钮即可获取 XMind 文件，可直接在 XMind 软件中打开使用",
+            "statistics": statistics
+        })
+    
+    def _parse_batch_jobs(self, batch_data: Any) -> list[dict]:
+        """解析批量任务：JSON数组、{"jobs": [...]} 或 JSONL，每个任务为 {root_title, json_data}"""
+        if isinstance(batch_data, str):
+            batch_str = batch_data.strip()
+            try:
+                batch_data = json.loads(batch_str)
+            except json.JSONDecodeError:
+                # 按 JSONL 逐行解析
+                batch_data = []
+                for line_number, line in enumerate(io.StringIO(batch_str), 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        batch_data.append(json.loads(line))
+                    except json.JSONDecodeError as e:
+                        raise ValueError(f"批量数据第 {line_number} 行不是有效的JSON: {e}")
+        
+        if isinstance(batch_data, dict):
+            batch_data = batch_data.get('jobs', [batch_data])
+        if not isinstance(batch_data, list):
+            raise ValueError("批量数据必须是任务数组或 JSONL")
+        
+        return [job if isinstance(job, dict) and 'json_data' in job else {"json_data": job} for job in batch_data]
+    
+    def _prepare_batch_job(self, job: dict, index: int, defaults: dict) -> tuple[str, Any, int]:
+        """解析单个批量任务的数据，返回 (根标题, 数据, 最大深度)"""
+        root_title = str(job.get('root_title') or f"思维导图 {index + 1}")
+        max_depth = job.get('max_depth') or defaults["max_depth"]
+        input_format = str(job.get('input_format') or defaults["input_format"]).lower().strip()
+        group_by = self._parse_group_by(job.get('group_by')) or defaults["group_by"]
+        
+        data = self._parse_input_data(job.get('json_data'), input_format, group_by)
+        if data is None:
+            raise ValueError("输入数据为空或无效")
+        return root_title, data, int(max_depth)
+    
+    def _convert_batch_job(self, job: dict, index: int, defaults: dict) -> tuple[bytes | None, dict]:
+        """将单个批量任务转换为独立的 .xmind 文件内容，失败时返回错误信息而不抛出"""
+        result = {"index": index, "root_title": str(job.get('root_title') or f"思维导图 {index + 1}")}
+        try:
+            root_title, data, max_depth = self._prepare_batch_job(job, index, defaults)
+            file_content, statistics = XmindConverter.from_options(defaults).convert(data, root_title, max_depth)
+            result.update({
+                "success": True,
+                "file_size": len(file_content),
+                "content_hash": hashlib.sha256(file_content).hexdigest(),
+                "statistics": statistics
+            })
+            return file_content, result
+        except Exception as e:
+            plugin_logger.error(f"❌ 批量任务 {index + 1} 转换失败: {e}")
+            result.update({"success": False, "error": str(e), "error_type": type(e).__name__})
+            return None, result
+    
+    def _invoke_batch(self, batch_data: Any, batch_title: str, batch_mode: str, defaults: dict, workers: Any) -> Generator[ToolInvokeMessage]:
+        """批量转换：输出单个多工作表工作簿，或包含多个 .xmind 的 zip，单个任务失败不影响整批"""
+        try:
+            jobs = self._parse_batch_jobs(batch_data)
+        except Exception as e:
+            plugin_logger.error(f"❌ 批量数据解析失败: {e}")
+            yield self.create_json_message({
+                "success": False,
+                "error": f"批量数据解析失败: {str(e)}",
+                "message": "批量模式需要任务数组（[{\"root_title\": ..., \"json_data\": ...}]）或每行一个任务的 JSONL"
+            })
+            return
+        
+        if not jobs:
+            yield self.create_json_message({
+                "success": False,
+                "error": "批量任务为空",
+                "message": "请至少提供一个转换任务"
+            })
+            return
+        
+        yield self.create_text_message(f"📦 批量模式: 共 {len(jobs)} 个任务，输出={batch_mode}")
+        
+        results = []
+        if batch_mode == 'workbook':
+            # 所有任务共享一个工作簿（DOM非线程安全），按顺序逐个写入工作表
+            workbook_converter = XmindConverter.from_options(defaults)
+            workbook = workbook_converter.create_workbook()
+            used_primary = False
+            for index, job in enumerate(jobs):
+                result = {"index": index, "root_title": str(job.get('root_title') or f"思维导图 {index + 1}")}
+                try:
+                    root_title, data, max_depth = self._prepare_batch_job(job, index, defaults)
+                    sheet = workbook.getPrimarySheet() if not used_primary else workbook.createSheet()
+                    used_primary = True
+                    sheet.setTitle(root_title)
+                    statistics = workbook_converter.fill_sheet(sheet, root_title, data, max_depth)
+                    result.update({"success": True, "statistics": statistics})
+                except Exception as e:
+                    plugin_logger.error(f"❌ 批量任务 {index + 1} 转换失败: {e}")
+                    result.update({"success": False, "error": str(e), "error_type": type(e).__name__})
+                results.append(result)
+            
+            succeeded = sum(1 for result in results if result["success"])
+            file_content = workbook_converter.save(workbook) if succeeded else None
+            filename = f"{batch_title}.xmind"
+            mime_type = XMIND_MIME_TYPE
+        else:
+            # 并行数不超过 CPU 核数和共享进程池的大小（JSON2XMIND_POOL_WORKERS）
+            try:
+                workers = max(1, min(int(workers), os.cpu_count() or 1, converter.POOL_MAX_WORKERS, len(jobs)))
+            except (TypeError, ValueError):
+                workers = 1
+            plugin_logger.info(f"⚙️ zip 批量并行数: {workers}")
+            
+            outputs = []
+            executor = converter.get_converter_pool() if workers > 1 else None
+            if executor is not None:
+                from collections import deque
+                from concurrent.futures.process import BrokenProcessPool
+                
+                # 各任务互不依赖，分发到共享的转换进程池并行转换；同时在途的任务不超过 workers 个，按顺序收取结果
+                pending = deque()
+                try:
+                    for index, job in enumerate(jobs):
+                        if len(pending) >= workers:
+                            outputs.append(pending.popleft().result())
+                        pending.append(executor.submit(_convert_batch_job_in_worker, job, index, defaults))
+                    while pending:
+                        outputs.append(pending.popleft().result())
+                except BrokenProcessPool as e:
+                    # 工作进程异常退出（如被 OOM 终止）：重置进程池，其余任务改为在当前线程转换
+                    plugin_logger.warning(f"⚠️ 转换进程池不可用，剩余 {len(jobs) - len(outputs)} 个任务改为在当前线程转换: {e}")
+                    converter._reset_converter_pool()
+            # 未经进程池完成的任务按顺序在当前线程转换
+            for index in range(len(outputs), len(jobs)):
+                outputs.append(self._convert_batch_job(jobs[index], index, defaults))
+            
+            # 打包为zip；.xmind 本身已压缩，直接存储即可
+            buffer = io.BytesIO()
+            used_names = set()
+            with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as archive:
+                for file_content, result in outputs:
+                    results.append(result)
+                    if file_content is None:
+                        continue
+                    name = re.sub(r'[\\/:*?"<>|]', '_', result["root_title"]) or f"思维导图 {result['index'] + 1}"
+                    filename = f"{name}.xmind"
+                    suffix = 2
+                    while filename in used_names:
+                        filename = f"{name} ({suffix}).xmind"
+                        suffix += 1
+                    used_names.add(filename)
+                    result["filename"] = filename
+                    archive.writestr(zip_entry(filename, defaults.get("deterministic", False)), file_content)
+            
+            succeeded = sum(1 for result in results if result["success"])
+            file_content = buffer.getvalue() if succeeded else None
+            filename = f"{batch_title}.zip"
+            mime_type = "application/zip"
+        
+        failed = len(results) - succeeded
+        yield self.create_text_message(f"📊 批量统计: 成功={succeeded}, 失败={failed}")
+        
+        if file_content is not None:
+            yield self.create_blob_message(
+                blob=file_content,
+                meta={
+                    "mime_type": mime_type,
+                    "filename": filename
+                }
+            )
+        
+        yield self.create_json_message({
+            "success": succeeded > 0,
+            "message": f"批量转换完成: {succeeded} 个成功，{failed} 个失败",
+            "filename": filename if file_content is not None else None,
+            "file_size": len(file_content) if file_content is not None else 0,
+            "content_hash": hashlib.sha256(file_content).hexdigest() if file_content is not None else None,
+            "statistics": {
+                "total_jobs": len(results),
+                "succeeded": succeeded,
+                "failed": failed
+            },
+            "jobs": results
+        })
+
+
+def _convert_batch_job_in_worker(job: dict, index: int, defaults: dict) -> tuple[bytes | None, dict]:
+    """进程池入口：在工作进程中使用独立的工具实例转换单个批量任务"""
+    return Json2xmindTool.from_credentials({})._convert_batch_job(job, index, defaults)
 
 # 模块加载完成日志
 plugin_logger.info("✅ Json2xmind 工具模块加载完成")
@@ -0,0 +1,213 @@
+from typing import Any
+import re
+
+from tools.converter import NAMED_COLORS, XmindConverter
+
+# 预览的默认展开深度与最多输出的节点数，超出部分只给出数量提示
+PREVIEW_DEFAULT_DEPTH = 3
+PREVIEW_MAX_NODES = 500
+
+# XMind 标记 → 预览中的符号；同一族只保留一个，与 XMind 的 addMarker 行为一致
+MARKER_GLYPHS = {
+    'priority-1': '1️⃣', 'priority-2': '2️⃣', 'priority-3': '3️⃣',
+    'priority-4': '4️⃣', 'priority-5': '5️⃣', 'priority-6': '6️⃣',
+    'task-start': '⬜', 'task-oct': '◔', 'task-quarter': '◔', 'task-3oct': '◑', 'task-half': '◑',
+    'task-5oct': '◑', 'task-3quar': '◕', 'task-7oct': '◕', 'task-done': '✅',
+    'smiley-smile': '😊', 'smiley-laugh': '😂', 'smiley-angry': '😠',
+    'smiley-cry': '😢', 'smiley-surprise': '😲', 'smiley-boring': '😴',
+    'symbol-plus': '➕', 'symbol-minus': '➖', 'symbol-question': '❓', 'symbol-exclam': '❗',
+    'symbol-info': 'ℹ️', 'symbol-wrong': '❌', 'symbol-right': '✔️',
+    'arrow-up': '⬆️', 'arrow-up-right': '↗️', 'arrow-right': '➡️', 'arrow-down-right': '↘️',
+    'arrow-down': '⬇️', 'arrow-down-left': '↙️', 'arrow-left': '⬅️', 'arrow-up-left': '↖️',
+    'arrow-refresh': '🔄',
+}
+# 星标、旗帜按族显示，不区分颜色
+MARKER_FAMILY_GLYPHS = {'star': '⭐', 'flag': '🚩'}
+NOTE_GLYPH = '📝'
+LINK_GLYPH = '🔗'
+FOLDED_GLYPH = '⊕'
+# 主题填充色 → 色块符号，只对应命名颜色
+COLOR_GLYPHS = {
+    NAMED_COLORS['red']: '🔴', NAMED_COLORS['orange']: '🟠', NAMED_COLORS['yellow']: '🟡', NAMED_COLORS['green']: '🟢',
+    NAMED_COLORS['blue']: '🔵', NAMED_COLORS['purple']: '🟣', NAMED_COLORS['black']: '⚫', NAMED_COLORS['white']: '⚪',
+}
+
+# Mermaid mindmap 中括号类字符会被解析为节点形状，替换为全角字符
+MERMAID_ESCAPES = str.maketrans({'(': '（', ')': '）', '[': '［', ']': '］', '{': '｛', '}': '｝'})
+MERMAID_SPACES_RE = re.compile(r'\s+')
+
+
+class PreviewTopic:
+    """只记录标题、标记、备注、链接和样式的轻量主题，实现 XmindConverter 用到的 TopicElement 接口子集
+
+    预览模式用它代替 xmind 的 DOM 主题，复用同一套转换逻辑，标题与元数据处理与生成的 .xmind 保持一致。
+    """
+
+    def __init__(self, title: str = ""):
+        self.title = title
+        self.markers: dict[str, str] = {}
+        self.notes: str | None = None
+        self.link: str | None = None
+        self.folded = False
+        self.style: dict[str, str] = {}
+        self.children: list["PreviewTopic"] = []
+        # 超出预览深度、未构建的子节点数
+        self.hidden_children = 0
+
+    def addSubTopic(self) -> "PreviewTopic":
+        child = PreviewTopic()
+        self.children.append(child)
+        return child
+
+    def getSubTopics(self) -> list["PreviewTopic"]:
+        return self.children
+
+    def getID(self) -> str:
+        return str(id(self))
+
+    def getTitle(self) -> str:
+        return self.title
+
+    def setTitle(self, title: str):
+        self.title = title
+
+    def addMarker(self, marker_id: str):
+        self.markers[marker_id.split('-', 1)[0]] = marker_id
+
+    def getNotes(self) -> str | None:
+        return self.notes
+
+    def setPlainNotes(self, content: str):
+        self.notes = content
+
+    def setURLHyperlink(self, url: str):
+        self.link = url
+
+    def setFileHyperlink(self, path: str):
+        self.link = path
+
+    def setTopicHyperlink(self, topic_id: str):
+        self.link = f"#{topic_id}"
+
+    def setFolded(self):
+        self.folded = True
+
+    def setPosition(self, x: int, y: int):
+        pass
+
+    def setStyleProperties(self, properties: dict[str, str]):
+        self.style = properties
+
+    def hide_children(self, count: int):
+        self.hidden_children = count
+
+    def glyphs(self) -> str:
+        """填充色、标记、备注、链接和折叠状态对应的符号串"""
+        glyphs = []
+        color_glyph = COLOR_GLYPHS.get(self.style.get('svg:fill'))
+        if color_glyph:
+            glyphs.append(color_glyph)
+        for family, marker_id in self.markers.items():
+            glyph = MARKER_GLYPHS.get(marker_id) or MARKER_FAMILY_GLYPHS.get(family)
+            if glyph:
+                glyphs.append(glyph)
+        if self.notes:
+            glyphs.append(NOTE_GLYPH)
+        if self.link:
+            glyphs.append(LINK_GLYPH)
+        if self.folded:
+            glyphs.append(FOLDED_GLYPH)
+        return ' '.join(glyphs)
+
+
+def build_preview_tree(data: Any, root_title: str, max_depth: int, preview_depth: int, options: dict,
+                       max_nodes: int = PREVIEW_MAX_NODES) -> tuple[PreviewTopic, int]:
+    """用与 .xmind 相同的转换逻辑构建预览树，返回 (预览树, 未构建的节点数)
+
+    只展开到 preview_depth 层，更深的分支只记录子节点数；最多按先序创建 max_nodes 个主题，
+    其余节点只做估算，超宽的输入也只构建实际显示的部分。
+    """
+    root = PreviewTopic(root_title)
+    converter = XmindConverter.from_options(options)
+    if max_depth <= preview_depth:
+        # 用户的 max_depth 先于预览深度截断数据，与生成 .xmind 时一样记录告警
+        omitted = converter.build_tree(root, data, max_depth, node_limit=max_nodes)
+    else:
+        omitted = converter.build_tree(root, data, preview_depth, warn_on_limit=False, node_limit=max_nodes,
+                                       on_truncated=PreviewTopic.hide_children)
+    return root, omitted
+
+
+def render_preview(root: PreviewTopic, preview_format: str, preview_depth: int, omitted: int = 0,
+                   max_nodes: int = PREVIEW_MAX_NODES) -> tuple[str, dict]:
+    """将预览树渲染为 Markdown 大纲或 Mermaid mindmap 文本，返回 (文本, 统计信息)
+
+    omitted 为构建预览树时已省略的节点数（见 build_preview_tree），计入末尾的未显示提示。
+    """
+    mermaid = preview_format == 'mermaid'
+    root_text = _topic_text(root, mermaid)
+    lines = ["```mermaid", "mindmap", f"  root(({_mermaid_text(root_text)}))"] if mermaid else [f"# {root_text}"]
+    shown = 0
+    truncated = False
+    # 构建时省略的部分是估算值
+    estimated = omitted > 0
+
+    # 迭代先序遍历，保持兄弟节点原有顺序
+    stack = [(child, 1) for child in reversed(root.children)]
+    while stack:
+        topic, depth = stack.pop()
+        if shown >= max_nodes:
+            omitted += 1 + topic.hidden_children + _count_topics(topic.children)
+            continue
+        shown += 1
+
+        text = _topic_text(topic, mermaid)
+        if (topic.children or topic.hidden_children) and depth >= preview_depth:
+            # 超出预览深度：只提示子节点数量
+            text = f"{text} …(+{len(topic.children) + topic.hidden_children})"
+            truncated = True
+        elif topic.children:
+            stack.extend((child, depth + 1) for child in reversed(topic.children))
+        lines.append(f"{'  ' * (depth + 1)}{_mermaid_text(text)}" if mermaid else f"{'  ' * (depth - 1)}- {text}")
+
+    if omitted:
+        count = f"约 {omitted}" if estimated else str(omitted)
+        notice = f"…（其余 {count} 个节点未显示）"
+        lines.append(f"    {_mermaid_text(notice)}" if mermaid else notice)
+    if mermaid:
+        lines.append("```")
+
+    return "\n".join(lines), {
+        "nodes_shown": shown,
+        "nodes_omitted": omitted,
+        "depth_truncated": truncated,
+    }
+
+
+def _topic_text(topic: PreviewTopic, mermaid: bool) -> str:
+    """节点标题加符号；Markdown 中保留粗体/斜体，网址链接渲染为可点击的链接"""
+    title = topic.title
+    if not mermaid and title:
+        if topic.style.get('fo:font-style') == 'italic':
+            title = f"*{title}*"
+        if topic.style.get('fo:font-weight') == 'bold':
+            title = f"**{title}**"
+    if not mermaid and topic.link and topic.link.startswith(('http://', 'https://', 'ftp://')):
+        title = f"[{title}]({topic.link})"
+    glyphs = topic.glyphs()
+    return f"{title} {glyphs}" if glyphs else title
+
+
+def _mermaid_text(text: str) -> str:
+    """Mermaid 节点文本需单行且不含形状定界符"""
+    return MERMAID_SPACES_RE.sub(' ', str(text).translate(MERMAID_ESCAPES)).strip() or '…'
+
+
+def _count_topics(topics: list[PreviewTopic]) -> int:
+    count = 0
+    stack = list(topics)
+    while stack:
+        topic = stack.pop()
+        count += 1 + topic.hidden_children
+        stack.extend(topic.children)
+    return count
@@ -0,0 +1,436 @@
+from collections.abc import Generator
+from typing import Any, BinaryIO
+import json
+import logging
+import os
+import tempfile
+import time
+import zipfile
+
+from dify_plugin import Tool
+from dify_plugin.entities.tool import ToolInvokeMessage
+from dify_plugin.config.logger_format import plugin_logger_handler
+
+from tools.converter import FONT_STYLES, NAMED_COLORS, TOPIC_SHAPES
+from tools.file_stream import SPOOL_MAX_SIZE, blob_chunk_messages, open_tool_file
+
+# 设置插件专用日志
+plugin_logger = logging.getLogger(__name__)
+plugin_logger.setLevel(logging.INFO)
+plugin_logger.addHandler(plugin_logger_handler)
+
+# 标记ID前缀 → json2xmind 使用的元数据键
+MARKER_KEYS = {
+    'priority': '_priority',
+    'star': '_star',
+    'flag': '_flag',
+    'task': '_task',
+    'smiley': '_emotion',
+    'symbol': '_symbol',
+    'arrow': '_arrow',
+}
+
+TOPIC_PROTOCOL = 'xmind:#'
+FILE_PROTOCOL = 'file://'
+XLINK_HREF = '{http://www.w3.org/1999/xlink}href'
+SVG_X = '{http://www.w3.org/2000/svg}x'
+SVG_Y = '{http://www.w3.org/2000/svg}y'
+
+# 主题样式（topic-properties 属性）→ json2xmind 的样式元数据，与 json2xmind 写出样式的映射相反
+STYLE_COLOR_KEYS = {'svg:fill': '_color', 'fo:color': '_text_color', 'line-color': '_branch_color'}
+# 色值/形状/字体样式 → 英文别名，没有别名的取值原样保留；同一取值有多个别名时取第一个
+COLOR_NAMES = {color: name for name, color in reversed(NAMED_COLORS.items()) if name.isascii()}
+SHAPE_NAMES = {shape: name for name, shape in reversed(TOPIC_SHAPES.items()) if name.isascii()}
+FONT_STYLE_NAMES = {style: name for name, style in reversed(FONT_STYLES.items()) if name.isascii()}
+# styles.xml 中的属性命名空间 → 前缀，还原为 svg:fill 这样的属性名（与 content.json 的写法一致）
+STYLE_NAMESPACES = {'http://www.w3.org/2000/svg': 'svg', 'http://www.w3.org/1999/XSL/Format': 'fo'}
+
+# 输出文件：紧凑格式增量序列化，文本片段攒够一批再编码写出
+JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+SERIALIZE_BATCH_SIZE = 64 * 1024
+
+
+class _SheetContext:
+    """单个工作表解析期间的状态：主题ID → (父ID, 键名)/节点，以及待解析的链接和连线"""
+
+    def __init__(self):
+        self.title = ""
+        self.root_title = ""
+        self.data: dict = {}
+        # 只记录父ID和键名，路径在需要时向上回溯拼接，避免为每个主题保存完整路径字符串
+        self.id_parents: dict[str, tuple[str | None, str]] = {}
+        self.id_nodes: dict[str, dict] = {}
+        self.topic_links: list[tuple[dict, str]] = []
+        self.relations: list[list] = []
+        self.topic_count = 0
+
+    def path_of(self, topic_id: str) -> str | None:
+        """回溯拼接主题路径（与 json2xmind 的路径索引格式一致），根主题返回根标题"""
+        if topic_id not in self.id_parents:
+            return None
+        parts = []
+        parent_id, key = self.id_parents[topic_id]
+        while parent_id is not None:
+            parts.append(key)
+            parent_id, key = self.id_parents.get(parent_id, (None, key))
+        return '/'.join(reversed(parts)) if parts else self.root_title
+
+
+class Xmind2jsonTool(Tool):
+    def _extract_workbook(self, stream: BinaryIO) -> list[dict]:
+        """打开 .xmind 压缩包并提取所有工作表，优先使用 XMind Zen 的 content.json"""
+        with zipfile.ZipFile(stream) as archive:
+            names = set(archive.namelist())
+            if 'content.json' in names:
+                with archive.open('content.json') as content:
+                    sheets = [self._extract_zen_sheet(sheet) for sheet in json.load(content)]
+            elif 'content.xml' in names:
+                styles = self._extract_styles(archive) if 'styles.xml' in names else {}
+                with archive.open('content.xml') as content:
+                    sheets = self._extract_content_xml(content, styles)
+            else:
+                raise ValueError("无效的XMind文件：缺少 content.xml 或 content.json")
+        return [self._finish_sheet(sheet) for sheet in sheets]
+
+    def _extract_styles(self, archive: zipfile.ZipFile) -> dict[str, dict]:
+        """读取 styles.xml（体积很小），返回 样式ID → 样式元数据；文件损坏时只记录告警，不影响内容提取"""
+        import xml.etree.ElementTree as ET
+
+        styles = {}
+        try:
+            with archive.open('styles.xml') as content:
+                for _, elem in ET.iterparse(content):
+                    if elem.tag.rsplit('}', 1)[-1] != 'style' or not elem.get('id'):
+                        continue
+                    for child in elem:
+                        if child.tag.rsplit('}', 1)[-1] == 'topic-properties':
+                            metadata = self._style_metadata({self._prefixed_name(name): value for name, value in child.attrib.items()})
+                            if metadata:
+                                styles[elem.get('id')] = metadata
+        except ET.ParseError as e:
+            plugin_logger.warning(f"⚠️ styles.xml 解析失败，忽略主题样式: {e}")
+        return styles
+
+    def _prefixed_name(self, name: str) -> str:
+        """ElementTree 的 {命名空间}属性名 → svg:fill 形式"""
+        if not name.startswith('{'):
+            return name
+        namespace, _, local = name[1:].partition('}')
+        prefix = STYLE_NAMESPACES.get(namespace)
+        return f"{prefix}:{local}" if prefix else local
+
+    def _style_metadata(self, properties: dict[str, str]) -> dict:
+        """topic-properties 属性 → _color/_text_color/_branch_color/_shape/_style 元数据，无法对应的属性忽略"""
+        metadata = {}
+        for attribute, key in STYLE_COLOR_KEYS.items():
+            color = str(properties.get(attribute) or "").strip()
+            if color:
+                metadata[key] = COLOR_NAMES.get(color.upper(), color)
+        shape = properties.get('shape-class')
+        if shape:
+            metadata['_shape'] = SHAPE_NAMES.get(shape, shape)
+        styles = [
+            FONT_STYLE_NAMES.get((attribute, value))
+            for attribute in ('fo:font-weight', 'fo:font-style', 'fo:text-decoration')
+            for value in str(properties.get(attribute) or "").split()
+        ]
+        styles = [style for style in styles if style]
+        if styles:
+            metadata['_style'] = ",".join(styles)
+        return metadata
+
+    def _extract_content_xml(self, content: BinaryIO, styles: dict[str, dict] | None = None) -> list[_SheetContext]:
+        """使用 iterparse 增量解析 content.xml，元素处理完立即从树中移除，内存只与当前路径深度相关
+
+        styles 为 styles.xml 中 样式ID → 样式元数据，主题的 style-id 据此还原为样式元数据。
+        """
+        # 只在提取旧版 XML 格式时才需要，延迟导入以缩短插件冷启动
+        import xml.etree.ElementTree as ET
+
+        sheets = []
+        sheet = None
+        # 元素栈与主题栈；主题栈帧: [节点字典, 子标题计数, 键名, 主题ID]
+        elements = []
+        frames = []
+
+        for event, elem in ET.iterparse(content, events=('start', 'end')):
+            tag = elem.tag.rsplit('}', 1)[-1]
+
+            if event == 'start':
+                elements.append(elem)
+                if tag == 'sheet':
+                    sheet = _SheetContext()
+                elif tag == 'topic' and sheet is not None:
+                    node = {}
+                    if elem.get('branch') == 'folded':
+                        node['_folded'] = True
+                    style_id = elem.get('style-id')
+                    if style_id and styles and style_id in styles:
+                        node.update(styles[style_id])
+                    href = elem.get(XLINK_HREF)
+                    if href:
+                        self._apply_href(node, href, sheet)
+                    frames.append([node, {}, None, elem.get('id')])
+                    sheet.topic_count += 1
+                elif tag == 'relationship' and sheet is not None:
+                    sheet.relations.append([elem.get('end1'), elem.get('end2'), None])
+                continue
+
+            elements.pop()
+            parent_tag = elements[-1].tag.rsplit('}', 1)[-1] if elements else None
+
+            if sheet is not None:
+                if tag == 'title':
+                    text = elem.text or ""
+                    if parent_tag == 'topic' and frames:
+                        self._assign_topic_key(frames, text, sheet)
+                    elif parent_tag == 'sheet':
+                        sheet.title = text
+                    elif parent_tag == 'relationship' and sheet.relations:
+                        sheet.relations[-1][2] = text
+                elif tag == 'marker-ref' and frames:
+                    self._apply_marker(frames[-1][0], elem.get('marker-id') or "")
+                elif tag == 'plain' and parent_tag == 'notes' and frames:
+                    note = (elem.text or "").strip()
+                    if note:
+                        frames[-1][0]['_note'] = note
+                elif tag == 'label' and frames:
+                    label = (elem.text or "").strip()
+                    if label:
+                        node = frames[-1][0]
+                        node['_label'] = f"{node['_label']}, {label}" if '_label' in node else label
+                elif tag == 'position' and parent_tag == 'topic' and frames:
+                    x, y = elem.get(SVG_X), elem.get(SVG_Y)
+                    if x is not None and y is not None:
+                        frames[-1][0]['_position'] = [int(float(x)), int(float(y))]
+                elif tag == 'topic' and frames:
+                    frame = frames.pop()
+                    if frame[2] is None:
+                        self._assign_topic_key(frames + [frame], "", sheet)
+                    if frames:
+                        frames[-1][0][frame[2]] = frame[0]
+                    else:
+                        sheet.root_title = frame[2]
+                        sheet.data = frame[0]
+                elif tag == 'sheet':
+                    sheets.append(sheet)
+                    sheet = None
+
+            # 释放已处理的元素，避免整棵DOM驻留内存
+            elem.clear()
+            if elements:
+                elements[-1].remove(elem)
+
+        return sheets
+
+    def _assign_topic_key(self, frames: list, title: str, sheet: _SheetContext):
+        """确定主题在父节点中的键名（同级重名追加序号）并登记ID → (父ID, 键名)"""
+        frame = frames[-1]
+        parent_id = None
+        if len(frames) == 1:
+            frame[2] = title
+        else:
+            parent = frames[-2]
+            key = title or f"节点{len(parent[1]) + 1}"
+            count = parent[1].get(key, 0) + 1
+            parent[1][key] = count
+            frame[2] = key if count == 1 else f"{key} ({count})"
+            parent_id = parent[3]
+        if frame[3]:
+            sheet.id_parents[frame[3]] = (parent_id, frame[2])
+            sheet.id_nodes[frame[3]] = frame[0]
+
+    def _extract_zen_sheet(self, sheet_data: dict) -> _SheetContext:
+        """解析 XMind Zen content.json 中的单个工作表"""
+        sheet = _SheetContext()
+        sheet.title = sheet_data.get('title') or ""
+        root = sheet_data.get('rootTopic') or {}
+        sheet.root_title = root.get('title') or ""
+        sheet.data = self._extract_zen_topic(root, sheet, None, sheet.root_title)
+        for relation in sheet_data.get('relationships') or []:
+            sheet.relations.append([relation.get('end1Id'), relation.get('end2Id'), relation.get('title')])
+        return sheet
+
+    def _extract_zen_topic(self, topic: dict, sheet: _SheetContext, parent_id: str | None, key: str) -> dict:
+        """递归转换 Zen 主题为 json2xmind 的字典结构"""
+        node = {}
+        sheet.topic_count += 1
+        topic_id = topic.get('id')
+        if topic_id:
+            sheet.id_parents[topic_id] = (parent_id, key)
+            sheet.id_nodes[topic_id] = node
+
+        for marker in topic.get('markers') or []:
+            self._apply_marker(node, marker.get('markerId') or "")
+        note = (((topic.get('notes') or {}).get('plain') or {}).get('content') or "").strip()
+        if note:
+            node['_note'] = note
+        labels = [str(label).strip() for label in topic.get('labels') or [] if str(label).strip()]
+        if labels:
+            node['_label'] = ", ".join(labels)
+        if topic.get('href'):
+            self._apply_href(node, topic['href'], sheet)
+        if topic.get('branch') == 'folded':
+            node['_folded'] = True
+        style_properties = (topic.get('style') or {}).get('properties')
+        if isinstance(style_properties, dict):
+            node.update(self._style_metadata(style_properties))
+        position = topic.get('position')
+        if isinstance(position, dict) and 'x' in position and 'y' in position:
+            node['_position'] = [int(position['x']), int(position['y'])]
+
+        counts = {}
+        children = topic.get('children') or {}
+        for child in children.get('attached') or []:
+            title = child.get('title') or f"节点{len(counts) + 1}"
+            count = counts.get(title, 0) + 1
+            counts[title] = count
+            child_key = title if count == 1 else f"{title} ({count})"
+            node[child_key] = self._extract_zen_topic(child, sheet, topic_id, child_key)
+        return node
+
+    def _apply_marker(self, node: dict, marker_id: str):
+        """将标记ID还原为 _priority/_star 等元数据"""
+        prefix, _, value = marker_id.partition('-')
+        key = MARKER_KEYS.get(prefix)
+        if not key or not value:
+            return
+        if key == '_priority':
+            try:
+                node[key] = int(value)
+            except ValueError:
+                pass
+        else:
+            node[key] = value
+
+    def _apply_href(self, node: dict, href: str, sheet: _SheetContext):
+        """还原超链接：主题链接待整表解析完成后转换为路径"""
+        if href.startswith(TOPIC_PROTOCOL):
+            sheet.topic_links.append((node, href[len(TOPIC_PROTOCOL):]))
+        elif href.startswith(FILE_PROTOCOL):
+            node['_file'] = href
+        else:
+            node['_url'] = href
+
+    def _finish_sheet(self, sheet: _SheetContext) -> dict:
+        """解析主题链接与关系连线，生成与 json2xmind 输入格式一致的工作表结果"""
+        for node, topic_id in sheet.topic_links:
+            node['_topic'] = sheet.path_of(topic_id) or topic_id
+
+        relation_count = 0
+        for end1, end2, title in sheet.relations:
+            source = sheet.id_nodes.get(end1)
+            target = sheet.path_of(end2)
+            if source is None or target is None:
+                continue
+            source.setdefault('_relations', []).append({"target": target, "title": title} if title else target)
+            relation_count += 1
+
+        return {
+            "title": sheet.title,
+            "root_title": sheet.root_title,
+            "json_data": sheet.data,
+            "topic_count": sheet.topic_count,
+            "relation_count": relation_count,
+        }
+
+    def _write_json(self, result: dict, output: BinaryIO):
+        """以紧凑格式增量序列化到输出流，不在内存中生成完整的JSON文本"""
+        batch = []
+        batch_size = 0
+        for fragment in JSON_ENCODER.iterencode(result):
+            batch.append(fragment)
+            batch_size += len(fragment)
+            if batch_size >= SERIALIZE_BATCH_SIZE:
+                output.write(''.join(batch).encode('utf-8'))
+                batch = []
+                batch_size = 0
+        output.write(''.join(batch).encode('utf-8'))
+
+    def _invoke(self, tool_parameters: dict[str, Any]) -> Generator[ToolInvokeMessage]:
+        plugin_logger.info("🚀 XMind2JSON工具开始执行")
+
+        try:
+            xmind_file = tool_parameters.get('xmind_file')
+            if not xmind_file:
+                yield self.create_json_message({
+                    "success": False,
+                    "error": "未提供XMind文件",
+                    "message": "请上传 .xmind 文件"
+                })
+                return
+
+            source_name = getattr(xmind_file, 'filename', None) or "mindmap.xmind"
+            yield self.create_text_message(f"🔧 开始解析XMind文件: {source_name}")
+
+            start_time = time.perf_counter()
+            stream = open_tool_file(xmind_file)
+            try:
+                stream.seek(0, os.SEEK_END)
+                archive_size = stream.tell()
+                stream.seek(0)
+                sheets = self._extract_workbook(stream)
+            except zipfile.BadZipFile as e:
+                raise ValueError(f"无效的XMind文件，无法解压: {str(e)}")
+            finally:
+                stream.close()
+            elapsed = time.perf_counter() - start_time
+
+            if not sheets:
+                raise ValueError("XMind文件中没有工作表")
+
+            primary = sheets[0]
+            total_topics = sum(sheet["topic_count"] for sheet in sheets)
+            plugin_logger.info(f"✅ XMind解析完成: 工作表={len(sheets)}, 主题数={total_topics}, 耗时={elapsed:.3f}s")
+            yield self.create_text_message(f"📊 统计信息: 工作表数={len(sheets)}, 总主题数={total_topics}")
+
+            result = {
+                "root_title": primary["root_title"],
+                "json_data": primary["json_data"],
+            }
+            if len(sheets) > 1:
+                result["sheets"] = [
+                    {"title": sheet["title"], "root_title": sheet["root_title"], "json_data": sheet["json_data"]}
+                    for sheet in sheets
+                ]
+            filename = f"{os.path.splitext(os.path.basename(source_name))[0] or primary['root_title']}.json"
+            statistics = {
+                "sheets": len(sheets),
+                "total_topics": total_topics,
+                "relations": sum(sheet["relation_count"] for sheet in sheets),
+                "archive_size": archive_size,
+                "elapsed_seconds": round(elapsed, 3)
+            }
+            # JSON 消息只带元数据，提取出的数据只写入文件一次
+            summary = {
+                "root_title": primary["root_title"],
+                "sheets": [
+                    {"title": sheet["title"], "root_title": sheet["root_title"], "topic_count": sheet["topic_count"]}
+                    for sheet in sheets
+                ],
+            }
+
+            with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as output:
+                self._write_json(result, output)
+                # 序列化完成后即释放提取结果，分块发送期间只保留落盘的文件
+                del result, primary, sheets
+                file_size = output.tell()
+                yield from blob_chunk_messages(output, {"mime_type": "application/json", "filename": filename})
+
+            yield self.create_json_message({
+                "success": True,
+                "message": "XMind文件已转换为JSON文件，文件中的 root_title 和 json_data 可直接作为 json2xmind 的输入",
+                "filename": filename,
+                "file_size": file_size,
+                **summary,
+                "statistics": statistics
+            })
+
+        except Exception as e:
+            plugin_logger.error(f"💥 XMind2JSON转换出错: {str(e)}", exc_info=True)
+            yield self.create_json_message({
+                "success": False,
+                "error": str(e),
+                "message": "解析XMind文件时发生错误，请确认文件格式正确",
+                "error_type": type(e).__name__
+            })